@@ -88,18 +88,31 @@ del cosmopy
 # ---- Import submodules
 
 from . import constants       # noqa
-# from . import evolution       # noqa
-# from . import gps             # noqa
-# from . import gravwaves       # noqa
-# from . import hardening       # noqa
-# from . import librarian       # noqa
-# from . import param_spaces    # noqa
-# from . import plot            # noqa
-# from . import population      # noqa
-# from . import host_relations  # noqa
-# from . import sams            # noqa
-# from . import librarian       # noqa
-from . import utils           # noqa
+
+# NOTE: all other submodules are imported lazily, when first accessed as attributes of the package
+#       (e.g. `holodeck.utils`), so that `import holodeck` does not import the entire package
+#       (and its heavier dependencies).  Explicit imports (e.g. `from holodeck import sams`) work as usual.
+_LAZY_SUBMODULES = [
+    "accretion", "anisotropy", "cyutils", "detstats", "discrete", "ems", "extensions",
+    "galaxy_profiles", "gps", "gravwaves", "hardening", "host_relations", "librarian",
+    "observations", "plot", "pop_observational", "relations", "sams", "single_sources", "utils",
+]
+
+
+def __getattr__(name):
+    """Import submodules on first access (PEP 562)."""
+    if name in _LAZY_SUBMODULES:
+        import importlib
+        module = importlib.import_module("." + name, __name__)
+        globals()[name] = module
+        return module
+
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY_SUBMODULES))
+
 
 # ---- Handle version
 
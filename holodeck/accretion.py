@@ -11,7 +11,7 @@ import os
 import numpy as np
 from scipy.interpolate import RectBivariateSpline
 from holodeck import _PATH_DATA
-from holodeck.constants import SPLC, EDDT
+from holodeck.constants import SPLC, EDDT, PC
 
 
 class Accretion:
@@ -2,6 +2,10 @@
 
 """
 
+import contextlib
+import functools
+from multiprocessing import cpu_count, get_context
+
 import numpy as np
 # import matplotlib as plt
 import matplotlib.cm as cm
@@ -30,9 +34,34 @@ NSIDE = 32
 NPIX = hp.nside2npix(NSIDE)
 LMAX = 8
 HC_REF15_10YR = 11.2*10**-15
+CL_REALIZE_CHUNK = 16    #: number of Poisson realizations drawn at once in `Cl_analytic_from_num`
+SHT_MATRIX_MAX_SIZE = 2**24     #: max (NPIX * Nalm) for which spherical harmonic transforms use dense matrices
+ANAFAST_ITER = 3     #: number of iterations used by `hp.anafast` (default), matched by the batched transform
+
+
+def healpix_flat_index_base(nfreqs, nreals, npix):
+    """ Offsets of each (frequency, realization) map within a flattened (F,R,NPIX) array.
+
+    Parameters
+    ----------
+    nfreqs : int
+        Number of frequencies.
+    nreals : int
+        Number of realizations.
+    npix : int
+        Number of pixels in each healpix map.
+
+    Returns
+    -------
+    base : (F,R,1) NDarray of int
+        Flat index of pixel zero for each map, such that ``base + pix`` indexes ``moll_hc.ravel()``.
+
+    """
+    base = np.arange(nfreqs)[:, np.newaxis, np.newaxis]*nreals + np.arange(nreals)[np.newaxis, :, np.newaxis]
+    return base * npix
 
 
-def healpix_map(hc_ss, hc_bg, nside=NSIDE, seed=None, ret_seed=False):
+def healpix_map(hc_ss, hc_bg, nside=NSIDE, seed=None, ret_seed=False, base=None):
     """ Build mollview array of hc^2/dOmega for a healpix map
 
     Parameters
@@ -43,13 +72,19 @@ def healpix_map(hc_ss, hc_bg, nside=NSIDE, seed=None, ret_seed=False):
         Characteristic strain of the background.
     nside : integer
         number of sides for healpix map.
+    seed : int or None
+        Seed for the `np.random.Generator` used to place single sources.  Drawn randomly if `None`.
+    ret_seed : bool
+        Whether to also return the seed.
+    base : (F,R,1) NDarray of int or None
+        Precomputed flat-index offsets from `healpix_flat_index_base`, to reuse across many calls
+        with the same geometry.  Calculated here if `None`.
 
     Returns
     -------
     moll_hc : (NPIX,) 1Darray
         Array of h_c^2/dOmega at every pixel for a mollview healpix map.
 
-    NOTE: Could speed up the for-loops, but it's ok for now.
     """
 
     npix = hp.nside2npix(nside)
@@ -61,18 +96,20 @@ def healpix_map(hc_ss, hc_bg, nside=NSIDE, seed=None, ret_seed=False):
     # set random seed
     if seed is None:
         seed = np.random.randint(99999)   # get a random number
-    print(f"random seed: {seed}")                           # print it out so we can reuse it if desired
-    np.random.seed(seed)
+    log.debug(f"random seed: {seed}")       # log it so we can reuse it if desired (see also `ret_seed`)
+    rng = np.random.default_rng(seed)
 
     # spread background evenly across pixels in moll_hc
     moll_hc = np.ones((nfreqs,nreals,npix)) * hc_bg[:,:,np.newaxis]**2/(npix*area) # (frequency, realization, pixel)
 
     # choose random pixels to place the single sources
-    pix_ss = np.random.randint(0, npix-1, size=nfreqs*nreals*nloudest).reshape(nfreqs, nreals, nloudest)
-    for ff in range(nfreqs):
-        for rr in range(nreals):
-            for ll in range(nloudest):
-                moll_hc[ff,rr,pix_ss[ff,rr,ll]] = (moll_hc[ff,rr,pix_ss[ff,rr,ll]] + hc_ss[ff,rr,ll]**2/area)
+    pix_ss = rng.integers(0, npix, size=(nfreqs, nreals, nloudest), dtype=np.int32)
+    # flatten (frequency, realization, pixel) indices so that all single sources are added in one call,
+    # `np.add.at` is unbuffered, so sources landing in the same pixel are all accumulated
+    if base is None:
+        base = healpix_flat_index_base(nfreqs, nreals, npix)
+    flat = base + pix_ss
+    np.add.at(moll_hc.reshape(-1), flat.ravel(), (hc_ss**2/area).ravel())
     if ret_seed:
         return moll_hc, seed
     return moll_hc
@@ -191,16 +228,145 @@ def healpix_hcsq_map(hc_ss, hc_bg, nside=NSIDE):
 
     return moll_hc2
 
-def sph_harm_from_map(moll_hc, lmax=LMAX):
+@functools.lru_cache(maxsize=4)
+def _sph_harm_matrix(nside, lmax):
+    """ Spherical harmonics Y_lm, for m >= 0, evaluated at the center of each healpix pixel.
+
+    The matrices are constructed using `hp.alm2map` on unit `alm` vectors, so that they use exactly
+    the same pixelization and normalization conventions as healpy.  The complex `alm` are represented
+    as real vectors ``x = [Re(alm), Im(alm)]``.
+
+    Parameters
+    ----------
+    nside : int
+        Number of sides for healpix map.
+    lmax : int
+        Highest harmonic to calculate.
+
+    Returns
+    -------
+    ylm : (NPIX, 2*Nalm) NDarray
+        ``[Re(Y_lm), -Im(Y_lm)]``, such that ``map @ ylm * 4pi/NPIX`` gives the real vector of `alm`
+        (i.e. `hp.map2alm` with ``iter=0``).  Columns are in the healpy `alm` ordering (see `hp.Alm`).
+    gram : (2*Nalm, 2*Nalm) NDarray
+        Round-trip operator such that ``x @ gram`` is the `alm` vector of the map synthesized from `x`.
+    mfac : (Nalm,) NDarray
+        Multiplicity of each `alm` in a real map: 1 for m == 0, and 2 for m > 0 (both signs of m).
+
+    """
+    npix = hp.nside2npix(nside)
+    nalm = hp.Alm.getsize(lmax)
+    _, mm = hp.Alm.getlm(lmax)
+    # m > 0 terms appear twice in real maps (once each for +m and -m)
+    mfac = np.where(mm == 0, 1.0, 2.0)
+    ylm = np.zeros((npix, 2*nalm))
+    alm = np.zeros(nalm, dtype=complex)
+    for ii in range(nalm):
+        # for a real map, healpy sums: a_l0 Y_l0 + 2 Re[a_lm Y_lm] for m > 0
+        alm[ii] = 1.0
+        ylm[:, ii] = hp.alm2map(alm, nside, lmax=lmax) / mfac[ii]
+        if mm[ii] > 0:
+            alm[ii] = 1.0j
+            ylm[:, nalm+ii] = hp.alm2map(alm, nside, lmax=lmax) / mfac[ii]
+        alm[ii] = 0.0
+
+    # synthesis is ``map = x @ (mfac * ylm).T``, followed by analysis ``map @ ylm * 4pi/NPIX``
+    weight = 4.0 * np.pi / npix
+    gram = weight * (np.tile(mfac, 2)[:, np.newaxis] * ylm.T) @ ylm
+
+    ylm.flags.writeable = False
+    gram.flags.writeable = False
+    mfac.flags.writeable = False
+    return ylm, gram, mfac
+
+
+def _anafast_batched(maps, lmax, niter=ANAFAST_ITER):
+    """ Calculate the angular power spectra of many healpix maps at once.
+
+    Equivalent to calling ``hp.anafast(mm, lmax=lmax, iter=niter)`` on each map, but the spherical
+    harmonic transforms of all maps are done together as a dense matrix product with precomputed Y_lm.
+    The iterative refinement of `hp.map2alm` is linear, so it is applied in `alm` space using the
+    small round-trip matrix, instead of transforming back to pixel space on each iteration.
+    This is only efficient for small `lmax`, see `SHT_MATRIX_MAX_SIZE`.
+
+    Parameters
+    ----------
+    maps : (B, NPIX) NDarray
+        Healpix maps in 'RING' ordering.
+    lmax : int
+        Highest harmonic to calculate.
+    niter : int
+        Number of iterations of the (Jacobi) `map2alm` refinement.
+
+    Returns
+    -------
+    Cl : (B, lmax+1) NDarray
+        Angular power spectra of each map.
+
+    """
+    npix = maps.shape[-1]
+    ylm, gram, mfac = _sph_harm_matrix(hp.npix2nside(npix), lmax)
+    nalm = mfac.size
+
+    # x_{k+1} = x_k + ana(map - syn(x_k)) = x_k + x_0 - x_k @ gram
+    xx = (4.0 * np.pi / npix) * (maps @ ylm)
+    x0 = xx.copy()
+    for _ in range(niter):
+        xx += x0 - xx @ gram
+
+    # Cl = sum_m |a_lm|^2 / (2l + 1), summed over both signs of m
+    ll, _ = hp.Alm.getlm(lmax)
+    proj = np.zeros((nalm, lmax+1))
+    proj[np.arange(nalm), ll] = mfac
+    Cl = (xx[:, :nalm]**2 + xx[:, nalm:]**2) @ proj / (2.0*np.arange(lmax+1) + 1.0)
+    return Cl
+
+
+def anafast_pool(nproc=None):
+    """ Start a pool of worker processes for `sph_harm_from_map`, to reuse across many calls.
+
+    Workers are started with the 'forkserver' method (as in `holodeck.gravwaves.GW_Discrete.emit`),
+    as forking after numba's parallel (e.g. TBB) threads have started can deadlock.  Calling scripts
+    must then be protected by an ``if __name__ == "__main__":`` guard.  The forkserver context is
+    shared by the whole process, so its preload list is left untouched here; workers import the
+    modules they need when first used.
+
+    Parameters
+    ----------
+    nproc : int or None
+        Number of processes.  If `None`, use all available cores.
+
+    Returns
+    -------
+    pool : ``multiprocessing.pool.Pool``
+        Use as a context manager, e.g. ``with anafast_pool(4) as pool: ...``.
+
+    """
+    if nproc is None:
+        nproc = cpu_count()
+    ctx = get_context('forkserver')
+    return ctx.Pool(nproc)
+
+
+def sph_harm_from_map(moll_hc, lmax=LMAX, nproc=1, pool=None):
     """ Calculate spherical harmonics from strains at every pixel of
     a healpix mollview map.
 
+    When the transform matrices are small enough (see `SHT_MATRIX_MAX_SIZE`), all of the maps are
+    transformed at once with `_anafast_batched`, otherwise `hp.anafast` is called on each map.
+
     Parameters
     ----------
     moll_hc : (F,R,NPIX,) 1Darray
         Characteristic strain of each pixel of a healpix map.
     lmax : int
         Highest harmonic to calculate.
+    nproc : int or None
+        Number of processes used to run `hp.anafast` over the (F*R) maps, when not batched.
+        If `1`, run serially.  If `None`, use all available cores.  A new pool is started on each
+        call (see `anafast_pool`), so when calling repeatedly, pass a `pool` instead.
+    pool : ``multiprocessing.pool.Pool`` or None
+        Existing pool of workers to use (e.g. from `anafast_pool`), in which case `nproc` is ignored.
 
     Returns
     -------
@@ -210,15 +376,33 @@ def sph_harm_from_map(moll_hc, lmax=LMAX):
     """
     nfreqs = len(moll_hc)
     nreals = len(moll_hc[0])
+    npix = np.shape(moll_hc)[-1]
+
+    # each (F,R) map is independent, so flatten them into contiguous rows
+    rows = np.ascontiguousarray(moll_hc).reshape(nfreqs*nreals, npix)
+    if npix * hp.Alm.getsize(lmax) <= SHT_MATRIX_MAX_SIZE:
+        Cl = _anafast_batched(rows, lmax)
+        return Cl.reshape(nfreqs, nreals, lmax+1)
+
+    anafast = functools.partial(hp.anafast, lmax=lmax, iter=ANAFAST_ITER)
+    # NOTE: the size of an existing `pool` is not public, assume one process per core for chunking
+    if (nproc is None) or (pool is not None):
+        nproc = cpu_count()
+    nproc = min(nproc, len(rows))
+
+    if (pool is not None) or (nproc > 1):
+        # pass large chunks to each process to amortize the pickling overhead
+        chunksize = max(1, len(rows) // (8*nproc))
+        # only close the pool if it was started here
+        with (contextlib.nullcontext(pool) if (pool is not None) else anafast_pool(nproc)) as pool:
+            Cl = pool.map(anafast, rows, chunksize=chunksize)
+    else:
+        Cl = [anafast(rr) for rr in rows]
 
-    Cl = np.zeros((nfreqs, nreals, lmax+1))
-    for ff in range(nfreqs):
-        for rr in range(nreals):
-            Cl[ff,rr,:] = hp.anafast(moll_hc[ff,rr], lmax=lmax)
-
+    Cl = np.asarray(Cl).reshape(nfreqs, nreals, lmax+1)
     return Cl
 
-def sph_harm_from_hc(hc_ss, hc_bg, nside = NSIDE, lmax = LMAX):
+def sph_harm_from_hc(hc_ss, hc_bg, nside = NSIDE, lmax = LMAX, nproc=1, base=None, pool=None):
     """ Calculate spherical harmonics and strain at every pixel
     of a healpix mollview map from single source and background char strains.
 
@@ -230,6 +414,12 @@ def sph_harm_from_hc(hc_ss, hc_bg, nside = NSIDE, lmax = LMAX):
         Characteristic strain of the background.
     nside : integer
         number of sides for healpix map.
+    nproc : int or None
+        Number of processes for the spherical harmonic transforms, see `sph_harm_from_map`.
+    base : (F,R,1) NDarray of int or None
+        Precomputed flat-index offsets passed to `healpix_map`.
+    pool : ``multiprocessing.pool.Pool`` or None
+        Existing pool of workers for the spherical harmonic transforms, see `sph_harm_from_map`.
 
     Returns
     -------
@@ -239,8 +429,8 @@ def sph_harm_from_hc(hc_ss, hc_bg, nside = NSIDE, lmax = LMAX):
         Spherical harmonic coefficients
 
     """
-    moll_hc = healpix_map(hc_ss, hc_bg, nside)
-    Cl = sph_harm_from_map(moll_hc, lmax)
+    moll_hc = healpix_map(hc_ss, hc_bg, nside, base=base)
+    Cl = sph_harm_from_map(moll_hc, lmax, nproc=nproc, pool=pool)
 
     return moll_hc, Cl
 
@@ -256,13 +446,14 @@ def plot_ClC0_medians(fobs, Cl_best, lmax, nshow):
     yy = Cl_best[:,:,:,1:]/Cl_best[:,:,:,0,np.newaxis] # (B,F,R,l)
     yy = np.median(yy, axis=-1) # (B,F,l) median over realizations
 
+    # median and 50%, 98% intervals over samples, calculated for all `l` in a single pass
+    conf = np.percentile(yy, [1, 25, 50, 75, 99], axis=0)  # (5,F,l)
+
     colors = cm.gist_rainbow(np.linspace(0, 1, lmax))
     for ll in range(lmax):
-        ax.plot(xx, np.median(yy[:,:,ll], axis=0), color=colors[ll], alpha=0.75, label='$l=%d$' % (ll+1))
-        for pp in [50, 98]:
-            percs = pp/2
-            percs = [50-percs, 50+percs]
-            ax.fill_between(xx, *np.percentile(yy[:,:,ll], percs, axis=0), alpha=0.1, color=colors[ll])
+        ax.plot(xx, conf[2,:,ll], color=colors[ll], alpha=0.75, label='$l=%d$' % (ll+1))
+        for lo, hi in [(1, 3), (0, 4)]:
+            ax.fill_between(xx, conf[lo,:,ll], conf[hi,:,ll], alpha=0.1, color=colors[ll])
 
         for bb in range(0,nshow):
             ax.plot(xx, yy[bb,:,ll], color=colors[ll], linestyle=':', alpha=0.1,
@@ -280,7 +471,7 @@ def plot_ClC0_medians(fobs, Cl_best, lmax, nshow):
 ######################################################################
 
 
-def lib_anisotropy(lib_path, hc_ref_10yr=HC_REF15_10YR, nbest=100, nreals=50, lmax=LMAX, nside=NSIDE):
+def lib_anisotropy(lib_path, hc_ref_10yr=HC_REF15_10YR, nbest=100, nreals=50, lmax=LMAX, nside=NSIDE, nproc=1):
 
     # ---- read in file
     hdf_name = lib_path+'/sam_lib.hdf5'
@@ -307,12 +498,16 @@ def lib_anisotropy(lib_path, hc_ref_10yr=HC_REF15_10YR, nbest=100, nreals=50, lm
     # ---- calculate spherical harmonics
 
     npix = hp.nside2npix(nside)
+    base = healpix_flat_index_base(nfreqs, nreals, npix)
     Cl_best = np.zeros((nbest, nfreqs, nreals, lmax+1 ))
-    moll_hc_best = np.zeros((nbest, nfreqs, nreals, npix))
-    for nn in range(nbest):
-        print('on nn=%d out of nbest=%d' % (nn,nbest))
-        moll_hc_best[nn,...], Cl_best[nn,...] = sph_harm_from_hc(
-            hc_ss[nsort[nn]], hc_bg[nsort[nn]], nside=nside, lmax=lmax, )
+    # maps are only stored for plotting, so use single precision (Cl are calculated from float64 maps)
+    moll_hc_best = np.zeros((nbest, nfreqs, nreals, npix), dtype=np.float32)
+    # start a single pool of workers (if any) for all samples, instead of one per sample
+    with (anafast_pool(nproc) if (nproc != 1) else contextlib.nullcontext()) as pool:
+        for nn in range(nbest):
+            print('on nn=%d out of nbest=%d' % (nn,nbest))
+            moll_hc_best[nn,...], Cl_best[nn,...] = sph_harm_from_hc(
+                hc_ss[nsort[nn]], hc_bg[nsort[nn]], nside=nside, lmax=lmax, base=base, pool=pool)
 
 
     # ---- save to npz file
@@ -328,7 +523,7 @@ def lib_anisotropy(lib_path, hc_ref_10yr=HC_REF15_10YR, nbest=100, nreals=50, lm
 
     output_name = output_dir+'/sph_harm_hc2dOm_lmax%d_nside%d_nbest%d_nreals%d.npz' % (lmax, nside, nbest, nreals)
     print('Saving npz file: ', output_name)
-    np.savez(output_name,
+    np.savez_compressed(output_name,
              nsort=nsort, fidx=fidx, hc_ref=hc_ref, ss_shape=shape,
          moll_hc_best=moll_hc_best, Cl_best=Cl_best, nside=nside, lmax=lmax, fobs=fobs)
 
@@ -341,7 +536,7 @@ def lib_anisotropy(lib_path, hc_ref_10yr=HC_REF15_10YR, nbest=100, nreals=50, lm
     fig.savefig(fig_name, dpi=300)
 
 
-def lib_anisotropy_split(lib_path, hc_ref_10yr=HC_REF15_10YR, nbest=100, nreals=50, lmax=LMAX, nside=NSIDE, split=2):
+def lib_anisotropy_split(lib_path, hc_ref_10yr=HC_REF15_10YR, nbest=100, nreals=50, lmax=LMAX, nside=NSIDE, split=2, nproc=1):
 
     # ---- read in file
     hdf_name = lib_path+'/sam_lib.hdf5'
@@ -365,47 +560,50 @@ def lib_anisotropy_split(lib_path, hc_ref_10yr=HC_REF15_10YR, nbest=100, nreals=
     print('Ranked samples by hc_ref = %.2e at fobs = %.2f/yr' % (hc_ref, fobs[fidx]*YR))
 
 
-    for ss in range(split):
-        bestrange = (np.array([ss, (ss+1)])*(nbest)/split).astype(int)
-        bestrange[1] = np.min([bestrange[1], nbest])
-        print(f"{bestrange=}")
-        # ---- calculate spherical harmonics
+    npix = hp.nside2npix(nside)
+    base = healpix_flat_index_base(nfreqs, nreals, npix)
+    # start a single pool of workers (if any) for all samples, instead of one per sample
+    with (anafast_pool(nproc) if (nproc != 1) else contextlib.nullcontext()) as pool:
+        for ss in range(split):
+            bestrange = (np.array([ss, (ss+1)])*(nbest)/split).astype(int)
+            bestrange[1] = np.min([bestrange[1], nbest])
+            print(f"{bestrange=}")
+            # ---- calculate spherical harmonics
 
-        npix = hp.nside2npix(nside)
-        Cl_best = np.zeros((bestrange[1]-bestrange[0], nfreqs, nreals, lmax+1 ))
-        moll_hc_best = np.zeros((bestrange[1]-bestrange[0], nfreqs, nreals, npix))
-        for ii, nn in enumerate(range(bestrange[0], bestrange[1])):
-            print('on nn=%d out of nbest=%d' % (nn,nbest))
-            moll_hc_best[ii,...], Cl_best[ii,...] = sph_harm_from_hc(
-                hc_ss[nsort[nn]], hc_bg[nsort[nn]], nside=nside, lmax=lmax, )
+            Cl_best = np.zeros((bestrange[1]-bestrange[0], nfreqs, nreals, lmax+1 ))
+            moll_hc_best = np.zeros((bestrange[1]-bestrange[0], nfreqs, nreals, npix), dtype=np.float32)
+            for ii, nn in enumerate(range(bestrange[0], bestrange[1])):
+                print('on nn=%d out of nbest=%d' % (nn,nbest))
+                moll_hc_best[ii,...], Cl_best[ii,...] = sph_harm_from_hc(
+                    hc_ss[nsort[nn]], hc_bg[nsort[nn]], nside=nside, lmax=lmax, base=base, pool=pool)
 
 
-        # ---- save to npz file
+            # ---- save to npz file
 
-        output_dir = lib_path+'/anisotropy'
-        # Assign output folder
-        import os
-        if (os.path.exists(output_dir) is False):
-            print('Making output directory.')
-            os.makedirs(output_dir)
-        else:
-            print('Writing to an existing directory.')
+            output_dir = lib_path+'/anisotropy'
+            # Assign output folder
+            import os
+            if (os.path.exists(output_dir) is False):
+                print('Making output directory.')
+                os.makedirs(output_dir)
+            else:
+                print('Writing to an existing directory.')
 
-        output_name =(output_dir+'/sph_harm_hc2dOm_lmax%d_ns%02d_r%d_b%02d-%-02d.npz'
-                      % (lmax, nside, nreals, bestrange[0], bestrange[1]-1))
-        print('Saving npz file: ', output_name)
-        np.savez(output_name,
-                nsort=nsort, fidx=fidx, hc_ref=hc_ref, ss_shape=shape,
-            moll_hc_best=moll_hc_best, Cl_best=Cl_best, nside=nside, lmax=lmax, fobs=fobs, split=split)
+            output_name =(output_dir+'/sph_harm_hc2dOm_lmax%d_ns%02d_r%d_b%02d-%-02d.npz'
+                          % (lmax, nside, nreals, bestrange[0], bestrange[1]-1))
+            print('Saving npz file: ', output_name)
+            np.savez_compressed(output_name,
+                    nsort=nsort, fidx=fidx, hc_ref=hc_ref, ss_shape=shape,
+                moll_hc_best=moll_hc_best, Cl_best=Cl_best, nside=nside, lmax=lmax, fobs=fobs, split=split)
 
 
-        # # ---- plot median Cl/C0
+            # # ---- plot median Cl/C0
 
-        # print('Plotting Cl/C0 for median realizations')
-        # fig = plot_ClC0_medians(fobs, Cl_best, lmax, nshow=(bestrange[1]-bestrange[0]))
-        # fig_name = (output_dir+'/sph_harm_hc2dOm_lmax%d_ns%02d_r%d_b%02d-%-02d.png'
-        #               % (lmax, nside, nreals, bestrange[0], bestrange[1]-1))
-        # fig.savefig(fig_name, dpi=300)
+            # print('Plotting Cl/C0 for median realizations')
+            # fig = plot_ClC0_medians(fobs, Cl_best, lmax, nshow=(bestrange[1]-bestrange[0]))
+            # fig_name = (output_dir+'/sph_harm_hc2dOm_lmax%d_ns%02d_r%d_b%02d-%-02d.png'
+            #               % (lmax, nside, nreals, bestrange[0], bestrange[1]-1))
+            # fig.savefig(fig_name, dpi=300)
 
 
 
@@ -413,7 +611,8 @@ def lib_anisotropy_split(lib_path, hc_ref_10yr=HC_REF15_10YR, nbest=100, nreals=
 ############# Analytic/Sato-Polito
 ######################################################################
 
-def Cl_analytic_from_num(fobs_orb_edges, number, hs, realize = False, floor = False):
+def Cl_analytic_from_num(fobs_orb_edges, number, hs, realize = False, floor = False,
+                         fobs_orb_widths=None, fobs_orb_cents=None):
     """ Calculate Cl using Eq. (17) of Sato-Polito & Kamionkowski
     Parameters
     ----------
@@ -427,6 +626,11 @@ def Cl_analytic_from_num(fobs_orb_edges, number, hs, realize = False, floor = Fa
         How many realizations to Poisson sample.
     floor : boolean
         Whether or not to round numbers down to nearest integers, if not realizing
+    fobs_orb_widths : (F,) 1Darray or None
+        Precomputed frequency bin widths, i.e. ``np.diff(fobs_orb_edges)``.  Callers evaluating many
+        populations on the same frequency bins can pass these to avoid recalculating them.
+    fobs_orb_cents : (F,) 1Darray or None
+        Precomputed frequency bin centers, i.e. ``kale.utils.midpoints(fobs_orb_edges)``.
 
     Returns
     -------
@@ -436,29 +640,42 @@ def Cl_analytic_from_num(fobs_orb_edges, number, hs, realize = False, floor = Fa
         C_l>0 for arbitrary l using shot noise approximation
     """
 
-    df = np.diff(fobs_orb_edges)                 #: frequency bin widths
-    fc = kale.utils.midpoints(fobs_orb_edges)    #: frequency-bin centers
-
-    # df = fobs_orb_widths[np.newaxis, np.newaxis, np.newaxis, :] # (M,Q,Z,F) NDarray
-    # fc = fobs_orb_cents[np.newaxis, np.newaxis, np.newaxis, :]  # (M,Q,Z,F) NDarray
+    if fobs_orb_widths is None:
+        fobs_orb_widths = np.diff(fobs_orb_edges)
+    if fobs_orb_cents is None:
+        fobs_orb_cents = kale.utils.midpoints(fobs_orb_edges)
+    df = fobs_orb_widths        #: frequency bin widths
+    fc = fobs_orb_cents         #: frequency-bin centers
 
+    # contract over (M,Q,Z) without materializing `number*hs**2` style temporaries
+    hs2 = hs*hs
+    hs4 = hs2*hs2
 
     # Poisson sample number in each bin
     if utils.isinteger(realize):
-        number = np.random.poisson(number[...,np.newaxis],
-                                size = (number.shape + (realize,)))
+        # draw realizations in chunks and reduce each one immediately, so that the full
+        # (R,M,Q,Z,F) array of sampled numbers is never held in memory.  Realizations are the
+        # leading axis, so that each one uses consecutive random numbers regardless of chunk size.
+        nh2 = np.zeros((number.shape[-1], realize))
+        nh4 = np.zeros_like(nh2)
+        for r0 in range(0, realize, CL_REALIZE_CHUNK):
+            r1 = min(r0 + CL_REALIZE_CHUNK, realize)
+            num = np.random.poisson(number, size=((r1 - r0,) + number.shape))
+            nh2[:, r0:r1] = np.einsum('rmqzf,mqzf->fr', num, hs2, optimize=True)
+            nh4[:, r0:r1] = np.einsum('rmqzf,mqzf->fr', num, hs4, optimize=True)
         df = df[...,np.newaxis]
         fc = fc[...,np.newaxis]
-        hs = hs[...,np.newaxis]
-    elif realize is True:
-        number = holo.gravwaves.poisson_as_needed(number)
-    elif floor is True: # assumes realize is False
-        number = np.floor(number)
-
+    else:
+        if realize is True:
+            number = holo.gravwaves.poisson_as_needed(number)
+        elif floor is True: # assumes realize is False
+            number = np.floor(number)
+        nh2 = np.einsum('mqzf,mqzf->f', number, hs2, optimize=True)
+        nh4 = np.einsum('mqzf,mqzf->f', number, hs4, optimize=True)
 
-    delta_term = (fc/(4*np.pi*df) * np.sum(number*hs**2, axis=(0,1,2)))**2
+    delta_term = (fc/(4*np.pi*df) * nh2)**2
 
-    Cl = (fc/(4*np.pi*df))**2 * np.sum(number*hs**4, axis=(0,1,2))
+    Cl = (fc/(4*np.pi*df))**2 * nh4
 
     C0 = Cl + delta_term
 
@@ -588,7 +805,7 @@ def Cl_analytic_from_dnum(edges, dnum, redz=None, realize=False):
 
         number = holo.sam_cython.integrate_differential_number_3dx1d(edges, dnum)
         shape = number.shape + (realize,)
-        number = holo.gravwaves.poisson_as_needed(number[...,np.newaxis] * np.ones(shape))
+        number = holo.gravwaves.poisson_as_needed(number[...,np.newaxis], size=shape)
 
         # numh2 = number * hs_cents**2 * np.diff(np.log(fobs_gw_edges))[:,np.newaxis]
         # numh4 = number * hs_cents**4 * np.diff(np.log(fobs_gw_edges))[:,np.newaxis]
@@ -664,14 +881,15 @@ def draw_sim(ax, xx, Cl_best, lmax, nshow, show_ci=True, show_reals=True):
     yy = Cl_best[:,:,:,1:]/Cl_best[:,:,:,0,np.newaxis] # (B,F,R,l)
     yy = np.median(yy, axis=-1) # (B,F,l) median over realizations
 
+    # median and 50%, 98% intervals over samples, calculated for all `l` in a single pass
+    conf = np.percentile(yy, [1, 25, 50, 75, 99], axis=0)  # (5,F,l)
+
     colors = ['k', 'b', 'r', 'g', 'c', 'm']
     for ll in range(lmax):
-        ax.plot(xx, np.median(yy[:,:,ll], axis=0), color=colors[ll]) #, label='median of samples, $l=%d$' % ll)
+        ax.plot(xx, conf[2,:,ll], color=colors[ll]) #, label='median of samples, $l=%d$' % ll)
         if show_ci:
-            for pp in [50, 98]:
-                percs = pp/2
-                percs = [50-percs, 50+percs]
-                ax.fill_between(xx, *np.percentile(yy[:,:,ll], percs, axis=0), alpha=0.1, color=colors[ll])
+            for lo, hi in [(1, 3), (0, 4)]:
+                ax.fill_between(xx, conf[lo,:,ll], conf[hi,:,ll], alpha=0.1, color=colors[ll])
         if show_reals:
             for bb in range(0,nshow):
                 # if ll==0 and bb==0:
@@ -194,6 +194,43 @@ cdef double gw_freq_dist_func__scalar_scalar(int nn, double ee):
     return gg
 
 
+@cython.boundscheck(False)
+@cython.wraparound(False)
+@cython.nonecheck(False)
+def gw_freq_dist_func(harms, eccen):
+    """Calculate the GW frequency distribution function, g(n,e), for arrays of harmonics and eccentricities.
+
+    Each element is calculated with `gw_freq_dist_func__scalar_scalar`, so (near-)zero eccentricities
+    are handled manually.  Otherwise this matches `holodeck.utils.gw_freq_dist_func`.
+
+    Parameters
+    ----------
+    harms : (N,) array_like of int,
+        The harmonic of each element.
+    eccen : (N,) array_like of double,
+        The eccentricity of each element.
+
+    Returns
+    -------
+    gne : (N,) ndarray of double,
+        The values of g(n,e).
+
+    """
+    cdef np.int64_t[:] nn = np.ascontiguousarray(harms, dtype=np.int64)
+    cdef double[:] ee = np.ascontiguousarray(eccen, dtype=np.float64)
+    cdef int size = nn.shape[0]
+    if ee.shape[0] != size:
+        raise ValueError(f"Sizes of `harms` ({size}) and `eccen` ({ee.shape[0]}) do not match!")
+
+    gne = np.zeros(size)
+    cdef double[:] gg = gne
+    cdef int ii
+    for ii in range(size):
+        gg[ii] = gw_freq_dist_func__scalar_scalar(<int>nn[ii], ee[ii])
+
+    return gne
+
+
 @cython.boundscheck(False)
 @cython.wraparound(False)
 @cython.nonecheck(False)
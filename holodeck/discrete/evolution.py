@@ -71,6 +71,8 @@ from __future__ import annotations
 # ! -- then call it again with a revision to the estimate, using right-edge values -- !
 # ! ===============================================================================================!
 
+
+import numba
 import numpy as np
 
 # import kalepy as kale
@@ -79,10 +81,11 @@ import numpy as np
 from holodeck import utils, cosmo, log
 from holodeck.discrete import population
 # from holodeck.constants import PC
-from holodeck.hardening import _Hardening
+from holodeck.hardening import _Hardening, is_hardening
 # from holodeck import accretion
 
 _MAX_ECCEN_ONE_MINUS = 1.0e-6
+_TRAPZ_LOGLOG_LNTOL = 1.0e-2       #: tolerance for power-law index of -1 in `_trapz_loglog_2pt`
 
 
 # =================================================================================================
@@ -172,8 +175,7 @@ class Evolution:
             raise TypeError(err)
 
         for hh in self._hard:
-            good = isinstance(hh, _Hardening) or issubclass(hh, _Hardening)
-            if not good:
+            if not is_hardening(hh):
                 err = f"hardening instance is {hh}, must be subclass of `{_Hardening}`!"
                 log.exception(err)
                 raise TypeError(err)
@@ -198,13 +200,17 @@ class Evolution:
         self.tlook = np.zeros(shape)           #: lookback time [sec], NOTE: negative after redshift zero
         self.sepa = np.zeros(shape)            #: semi-major axis (separation) [cm]
         self.mass = np.zeros(shape + (2,))     #: mass of BHs [g], 0-primary, 1-secondary
-        self.mdot = np.zeros(shape + (2,))     #: accretion rate onto each component of binary [g/s]
+        self.mdot = None                       #: accretion rate onto each component [g/s], `None` w/o accretion
         self.dadt = np.zeros(shape)            #: hardening rate in separation [cm/s]
         self.eccen = eccen                     #: eccentricity [], `None` if not being evolved
         self.dedt = dedt                       #: eccen evolution rate [1/s], `None` if not evolved
 
         # Derived and internal parameters
         self._freq_orb_rest = None
+        self._freq_orb_obs = None
+        self._redz = None
+        self._xold_cache = dict()
+        self._scafa_nonfinite = None
         self._evolved = False
         self._coal = None
 
@@ -236,11 +242,12 @@ class Evolution:
         self._init_step_zero()
 
         # ---- Iterate through all integration steps
-        size, nsteps = self.shape
+        nsteps = self.steps
         steps_list = range(1, nsteps)
         steps_list = utils.tqdm(steps_list, desc="evolving binaries") if progress else steps_list
+        take_next_step = self._take_next_step
         for step in steps_list:
-            self._take_next_step(step)
+            take_next_step(step)
 
         # ---- Finalize
         self._finalize()
@@ -329,14 +336,13 @@ class Evolution:
           `_LIN_INTERP_PARS` array are interpolated at 1st-order in lin-lin space.  Parameters
           which can be negative should be interpolated in linear space.  Passing a boolean for the
           `lin_interp` parameter will override the behavior (see `Parameters` above).
+        * If the only requested parameter is `xpar` itself (e.g. ``params=['sepa']``), the targets
+          are returned directly, with out of bounds values set to `np.nan`.
 
         """
         # parse/sanitize input arguments
         xnew, xold, params, lin_interp_list, rev, squeeze = self._at__inputs(xpar, targets, params, lin_interp)
 
-        # (N, M); scale-factors; make sure direction matches that of `xold`
-        scafa = self.scafa[:, ::-1] if rev else self.scafa[...]
-
         # find indices between which to interpolate, and the fractional distance to go between them
         cut_idx, interp_frac, valid = self._at__index_frac(xnew, xold)
 
@@ -346,33 +352,58 @@ class Evolution:
 
         # Valid binaries must be valid at both `bef` and `aft` indices
         # BUG: is this actually doing what it's supposed to be doing?
-        for cc in cut_idx:
-            valid = valid & np.isfinite(np.take_along_axis(scafa, cc, axis=-1))
+        # only binaries with any non-finite scale-factors need to be checked
+        bad = self._scafa_nonfinite_rows
+        if np.any(bad):
+            # (B, M); scale-factors; make sure direction matches that of `xold`
+            scafa = self.scafa[bad, ::-1] if rev else self.scafa[bad]
+            for cc in cut_idx:
+                valid[bad] &= np.isfinite(np.take_along_axis(scafa, cc[bad], axis=-1))
 
         invalid = ~valid
 
+        # Interpolating the variable of interpolation to the targets just returns the targets
+        if (len(params) == 1) and (params[0] == xpar):
+            ynew = np.empty(invalid.shape)
+            ynew[...] = np.atleast_1d(targets)[np.newaxis, :]
+            ynew[invalid] = np.nan
+            if squeeze:
+                ynew = ynew[:, 0]
+            return {xpar: ynew}
+
+        # (N, T) 'after' indices; the 'before' indices are always the adjacent step
+        # Convert indices back to the original step order (instead of reversing each data array)
+        aft_idx = cut_idx[0]
+        if rev:
+            aft_idx = (self.steps - 1) - aft_idx
+        bef_step = +1 if rev else -1
+
         data = dict()
-        # Interpolate each parameter to the given locations, store to `dict`
+        # Load the raw evolution data for each parameter, can be None or ndarray shaped (N, M) or (N, M, 2)
+        names = []
+        yolds = []
         for par in params:
-            # Load the raw evolution data for this parameter, can be None or ndarray shaped (N, M) or (N, M, 2)
             yold = getattr(self, par)
             if yold is None:
                 data[par] = None
                 continue
+            names.append(par)
+            yolds.append(yold)
 
-            # Reverse data to match x-values, if needed
-            if rev:
-                yold = yold[..., ::-1]
-
-            # interpolate
-            lin_interp_flag = (par in lin_interp_list)
-            ynew = self._at__interpolate_array(yold, cut_idx, interp_frac, lin_interp_flag)
+        # Interpolate all parameters to the given locations at once
+        lin_interp_flags = [(par in lin_interp_list) for par in names]
+        # only binaries with at least one valid target are interpolated, e.g. if ``coal=True``
+        rows = np.any(valid, axis=-1)
+        ynews = self._at__interpolate_array(yolds, rows, aft_idx, bef_step, interp_frac, lin_interp_flags)
 
+        # store each parameter to `dict`
+        for par, ynew in zip(names, ynews):
             # fill 'invalid' (i.e. out of bounds, or non-coalescing binaries if ``coal==True``)
             ynew[invalid, ...] = np.nan
-            # remove excess dimensions if a single target was requested (i.e. ``T=1``)
+            # remove the target dimension if a single target was requested (i.e. ``T=1``)
+            # NOTE: select it explicitly (a view), `squeeze` would also drop the binary axis for N=1
             if squeeze:
-                ynew = ynew.squeeze()
+                ynew = ynew[:, 0]
             # store
             data[par] = ynew
 
@@ -451,22 +482,28 @@ class Evolution:
         # Observer-frame orbital frequency, units of [1/sec] = [Hz]
         if xpar == 'fobs':
             # frequency is already increasing (must be true for interplation later)
-            xold = np.log10(self.freq_orb_obs)
+            if xpar not in self._xold_cache:
+                xold = np.log10(self.freq_orb_obs)
+                self._xold_cache[xpar] = (xold, utils.minmax(xold))
             xnew = np.log10(targets)
             rev = False
         # Binary-Separation, units of [cm]
         elif xpar == 'sepa':
             # separation is decreasing, reverse to increasing (for interpolation)
-            xold = np.log10(self.sepa)[:, ::-1]
+            if xpar not in self._xold_cache:
+                xold = np.ascontiguousarray(np.log10(self.sepa)[:, ::-1])
+                self._xold_cache[xpar] = (xold, utils.minmax(xold))
             xnew = np.log10(targets)
             rev = True
         else:   # nocov
             # This should never be reached, we already checked `xpar` is valid above
             raise ValueError("Bad `xpar` {}!".format(xpar))
 
+        # `xold` values and their extrema are cached, as they only change if the evolution is modified
+        xold, xextr = self._xold_cache[xpar]
+
         # Make sure target values are within bounds
         textr = utils.minmax(xnew)
-        xextr = utils.minmax(xold)
         if (textr[1] < xextr[0]) | (textr[0] > xextr[1]):
             err = "`targets` extrema ({}) outside `xvals` extema ({})!  Bad units?".format(
                 (10.0**textr), (10.0**xextr))
@@ -505,21 +542,15 @@ class Evolution:
 
         """
         # ---- For every binary, find the step index immediately following each target value
-        # (N, T, M) | `xnew` is (T,) for T-targets,  `xold` is (N, M) for N-binaries and M-steps
-        select = (xnew[np.newaxis, :, np.newaxis] <= xold[:, np.newaxis, :])
-        # (N, T), xvalue index [0, M-1] following each target point (T,), for each binary (N,)
-        aft = np.argmax(select, axis=-1)
+        # `xnew` is (T,) for T-targets,  `xold` is (N, M) for N-binaries and M-steps
+        # (2, N, T), xvalue indices [0, M-1] following (0th) and preceding (1th) each target point (T,),
+        # for each binary (N,)
+        cut_idx = _searchsorted_rows(xold, xnew)
 
         # ---- Determine which locations are 'valid' (i.e. within the evolutionary tracks)
         # zero values in `aft` mean no `xold` after the targets were found; these are 'invalid',
         # these will be converted to `np.nan` later
-        valid = (aft > 0)
-
-        # ---- get the x-value index immediately preceding each target point
-        bef = np.copy(aft)
-        bef[valid] -= 1
-        # (2, N, T)
-        cut_idx = np.array([aft, bef])
+        valid = (cut_idx[0] > 0)
 
         # Get the x-values before and after the target locations  (2, N, T)
         xold_temp = [np.take_along_axis(xold, cc, axis=-1) for cc in cut_idx]
@@ -533,72 +564,79 @@ class Evolution:
 
         return cut_idx, interp_frac, valid
 
-    def _at__interpolate_array(self, yold, cut_idx, interp_frac, lin_interp_flag):
-        """Interpolate a parameter to a fraction between integration steps.
+    def _at__interpolate_array(self, yolds, rows, aft_idx, bef_step, interp_frac, lin_interp_flags):
+        """Interpolate parameters to a fraction between integration steps.
 
         Parameters
         ----------
-        yold : np.ndarray
-            The data to be interpolated.  This is the raw evolution data, for each binary and
-            each step.  Shaped either as (N, M) or (N, M, 2) if parameter is mass.
-        cut_idx : np.ndarray
-            For each binary, the step-number indices between which to interpolate, for each target
-            interpolation point.  shape (2, N, T); where the 0th dimension, the 0th value is the
-            low/before index, and the 1th value is the high/after index.
-            i.e. for binary 'i' and target 'j', we need to interpolate between indices given by
-            [0, i, j] and [1, i, j].
+        yolds : list[np.ndarray]
+            The data to be interpolated, for each parameter.  This is the raw evolution data, for
+            each binary and each step.  Each is shaped either as (N, M) or (N, M, 2) if parameter is
+            mass.
+        rows : np.ndarray
+            Boolean array of shape (N,), specifying which binaries to interpolate.  The values for
+            other binaries are set to `np.nan`.
+        aft_idx : np.ndarray
+            For each binary, the step-number index following each target interpolation point (in
+            the interpolation variable).  Shape (N, T).
+        bef_step : int, {-1, +1}
+            Offset from the `aft_idx` to the step preceding each target, i.e. the 'before' index
+            is ``aft_idx + bef_step`` (limited to the valid range of steps).
         interp_frac : np.ndarray
             The fractional distance between the low value and the high value, to interpolate to.
-            Shape (2, N, M).  For binary 'i' and target 'j', `interp_frac[i, j]` is how the
-            fraction of the way, from index `cut_idx[0, i, j]` to `cut_idx[1, i, j]` to interpolate
+            Shape (N, T).  For binary 'i' and target 'j', `interp_frac[i, j]` is how the
+            fraction of the way, from the 'before' index to the 'after' index to interpolate
             to, in the `data` array.
-        lin_interp_flag : bool,
-            Whether data should be interpolated in lin-lin space (True), or log-log space (False).
+        lin_interp_flags : list[bool],
+            For each parameter, whether data should be interpolated in lin-lin space (True), or
+            log-log space (False).
 
         Returns
         -------
-        ynew : np.ndarray
-            The input `data` interpolated to the new target locations.
+        ynews : list[np.ndarray]
+            The input `data` interpolated to the new target locations, for each parameter.
             Shape is (N, T) or (N, T, 2) for N-binaries, T-target points.  A third dimension is
             present if the input `data` was 3D.
 
         """
+        if len(yolds) == 0:
+            return []
 
-        reshape = False
-        cut = cut_idx
-        frac = interp_frac
+        # the kernel always works on (N, M, K) data, add a trailing axis for scalar data
         # Sometimes there is a third dimension for the 2 binaries (e.g. `mass`)
         #    which will have shape, (N, T, 2) --- calling this "double-data"
-        if np.ndim(yold) != 2:
-            if (np.ndim(yold) == 3) and (np.shape(yold)[-1] == 2):
-                # Keep the interpolation axis last (N, T, 2) ==> (N, 2, T)
-                yold = np.moveaxis(yold, -1, -2)
-                # Expand other arrays appropriately
-                cut = cut[:, :, np.newaxis]
-                frac = frac[:, np.newaxis, :]
-                reshape = True
-            else:   # nocov
+        double = []
+        data = []
+        for yold in yolds:
+            dd = (np.ndim(yold) != 2)
+            if dd and ((np.ndim(yold) != 3) or (np.shape(yold)[-1] != 2)):   # nocov
                 raise ValueError("Unexpected shape of yold: {}!".format(np.shape(yold)))
-
-        if not lin_interp_flag:
-            yold = np.log10(yold)
-
-        # (2, N, T) for scalar data or (2, N, 2, T) for "double-data"
-        yold = [np.take_along_axis(yold, cc, axis=-1) for cc in cut]
-        # Interpolate by `frac` for each binary   (N, T) or (N, 2, T) for "double-data"
-        ynew = yold[1] + (np.subtract(*yold) * frac)
-        # In the "double-data" case, move the doublet back to the last dimension
-        #    (N, T) or (N, T, 2)
-        if reshape:
-            ynew = np.moveaxis(ynew, 1, -1)
-
-        # fill return dictionary
-        if not lin_interp_flag:
-            ynew = 10.0 ** ynew
-
-        return ynew
-
-    def sample_universe(self, fobs_orb_edges, down_sample=None):
+            double.append(dd)
+            data.append(np.ascontiguousarray(yold if dd else yold[..., np.newaxis]))
+
+        # one output plane for each component of each parameter
+        log_flags = np.concatenate([
+            np.full(dat.shape[-1], not flag) for dat, flag in zip(data, lin_interp_flags)
+        ])
+
+        # (K, N, T); gather, (log-)interpolate, and (exponentiate) all parameters in a single pass
+        ynew = _interp_gather(tuple(data), rows, aft_idx, bef_step, interp_frac, log_flags)
+
+        # (N, T) for scalar data or (N, T, 2) for "double-data"
+        # NOTE: for "double-data" this is a view, each component remains a contiguous (N, T) plane
+        ynews = []
+        kk = 0
+        for dd in double:
+            if dd:
+                ynews.append(np.moveaxis(ynew[kk:kk+2], 0, -1))
+                kk += 2
+            else:
+                ynews.append(ynew[kk])
+                kk += 1
+
+        return ynews
+
+    def sample_universe(self, fobs_orb_edges, down_sample=None, kde=True):
         """Construct a full universe of binaries based on resampling this population.
 
         Parameters
@@ -608,6 +646,11 @@ class Evolution:
         down_sample : None or float,
             Factor by which to downsample the resulting population.
             For example, `10.0` will produce 10x fewer output binaries.
+        kde : bool,
+            Whether to resample using a kernel density estimate (KDE) of the binary parameters.
+            If False, binaries are instead drawn directly from the weighted values (a weighted
+            bootstrap), which is much faster for large numbers of samples, but only reproduces the
+            values at the target frequencies instead of smoothing between them.
 
         Returns
         -------
@@ -640,11 +683,13 @@ class Evolution:
         # names = ['mtot', 'mrat', 'redz', 'fobs']
         names, vals, weights = self._sample_universe__at_values_weights(fobs_orb_edges)
 
-        samples = self._sample_universe__resample(fobs_orb_edges, vals, weights, down_sample)
+        samples = self._sample_universe__resample(fobs_orb_edges, vals, weights, down_sample, kde=kde)
 
-        # Convert back to normal-space
-        samples = np.asarray([10.0 ** ss for ss in samples])
-        vals = np.asarray([10.0 ** vv for vv in vals])
+        # Convert back to normal-space, (4, S) and (4, V); in-place to avoid additional copies
+        samples = np.asarray(samples, dtype=float)
+        np.power(10.0, samples, out=samples)
+        vals = np.asarray(vals, dtype=float)
+        np.power(10.0, vals, out=vals)
         return names, samples, vals, weights
 
     def _sample_universe__at_values_weights(self, fobs_orb_edges):
@@ -693,19 +738,20 @@ class Evolution:
         dcom = cosmo.z_to_dcom(redz)
 
         # `mass` has shape (Binaries, Frequencies, 2), units [gram]
-        #    convert to (2, B, F), then separate into m1, m2 each with shape (B, F)
+        #    separate into m1, m2 each with shape (B, F); these are contiguous views (see `_interp_gather`)
         m1, m2 = np.moveaxis(data_fobs['mass'], -1, 0)
         dfdt, _ = utils.dfdt_from_dadt(data_fobs['dadt'], data_fobs['sepa'], frst_orb=frst_orb_cents)
 
         _lambda_factor = utils.lambda_factor_dlnf(frst_orb_cents, dfdt, redz, dcom=dcom) / self._sample_volume
         num_binaries = _lambda_factor * dlnf[np.newaxis, :]
 
-        # select only valid entries
-        mt, mr = utils.mtmr_from_m1m2(m1[valid], m2[valid])
-        # broadcast `fobs` to match the shape of binaries, then select valid entries
-        fo = (fobs_orb_cents[np.newaxis, :] * np.ones_like(redz))[valid]
-        redz = redz[valid]
-        weights = num_binaries[valid]
+        # select only valid entries, using the same flattened indices for each (B, F) array
+        idx = np.flatnonzero(valid)
+        mt, mr = utils.mtmr_from_m1m2(m1.take(idx), m2.take(idx))
+        # frequency-bin index of each valid entry is its flattened index modulo `F`
+        fo = fobs_orb_cents.take(idx % fobs_orb_cents.size)
+        redz = redz.take(idx)
+        weights = num_binaries.take(idx)
         log.debug(f"Weights (lambda values) at targets: {utils.stats(weights)}")
 
         # Convert to log-space
@@ -713,8 +759,7 @@ class Evolution:
         names = ['mtot', 'mrat', 'redz', 'fobs']
         return names, vals, weights
 
-    def _sample_universe__resample(self, fobs_orb_edges, vals, weights, down_sample):
-        import kalepy as kale
+    def _sample_universe__resample(self, fobs_orb_edges, vals, weights, down_sample, kde=True):
         # down-sample weights to decrease the number of sample points
         prev_sum = weights.sum()
         log.info(f"Total weights (number of binaries in the universe): {prev_sum:.8e}")
@@ -727,8 +772,14 @@ class Evolution:
         # TODO/FIX: Consider sampling in comoving-volume instead of redz (like in sam.py)
         #           can also return dcom instead of redz for easier strain calculation
         nsamp = np.random.poisson(weights.sum())
-        reflect = [None, [None, 0.0], None, np.log10([fobs_orb_edges[0], fobs_orb_edges[-1]])]
-        samples = kale.resample(vals, size=nsamp, reflect=reflect, weights=weights, bw_rescale=0.5)
+        if kde:
+            import kalepy as kale
+            reflect = [None, [None, 0.0], None, np.log10([fobs_orb_edges[0], fobs_orb_edges[-1]])]
+            samples = kale.resample(vals, size=nsamp, reflect=reflect, weights=weights, bw_rescale=0.5)
+        else:
+            # weighted bootstrap: draw each sample directly from one of the values
+            idx = np.random.choice(weights.size, size=nsamp, p=weights/weights.sum())
+            samples = np.asarray(vals)[:, idx]
         # samples = np.power(10.0, samples)
         num_samp = samples[0].size
         log.debug(f"Sampled {num_samp:.8e} binaries in the universe")
@@ -751,30 +802,50 @@ class Evolution:
         # ---- Initialize basic parameters
 
         # Initialize ALL separations ranging from initial to mutual-ISCO, for each binary
-        rad_isco = utils.rad_isco(*pop.mass.T)
+        rad_isco = utils.rad_isco(pop.mass.sum(axis=-1))
         # (2, N)
         sepa = np.log10([pop.sepa, rad_isco])
         # Get log-space range of separations for each of N ==> (N, S), for S steps
-        sepa = np.apply_along_axis(lambda xx: np.logspace(*xx, nsteps), 0, sepa).T
-        self.sepa[:, :] = sepa
+        sepa = np.linspace(sepa[0], sepa[1], nsteps, axis=-1)
+        np.power(10.0, sepa, out=self.sepa)
         if (pop.eccen is not None):
             self.eccen[:, 0] = pop.eccen
 
         self.scafa[:, 0] = pop.scafa
+        # equivalent to `cosmo.z_to_tlbk`, but without rebuilding its interpolant
         redz = cosmo.a_to_z(pop.scafa)
-        tlook = cosmo.z_to_tlbk(redz)
-        self.tlook[:, 0] = tlook
+        self.tlook[:, 0] = utils.cosmo_pchip(cosmo, '_grid_z', '_grid_lbk', '_sort_z')(redz)
         # `pop.mass` has shape (N, 2), broadcast to (N, S, 2) for `S` steps
-        # self.mass[:, :, :] = pop.mass[:, np.newaxis, :]
-        self.mass[:, 0, :] = pop.mass
         # HERE INITIAL MASSES ARE COPIED FOR EVERY STEP
-        self.mass[:, :, :] = self.mass[:, 0, np.newaxis, :]
+        # NOTE: the full (N, S, 2) array is kept even without accretion, as hardening models,
+        #       modifiers and `Evolution.at` all read (and may write) per-step masses
+        self.mass[:, :, :] = pop.mass[:, np.newaxis, :]
+
+        # Interpolant for converting lookback times to scale-factors in each step.  This is the same
+        # interpolant constructed (on every call) by `cosmo.tlbk_to_z`, but built only once.
+        pchip = utils.cosmo_pchip(cosmo, '_grid_lbk', '_grid_z', '_sort_lbk')
+        self._tlbk_to_z_pchip = (pchip.x, pchip.c)
+
+        # Scratch buffers for the net hardening rates, reused on every call to `_hardening_rate`,
+        # the rates from each of H hardening models are stored in (H, N) arrays and then summed
+        nhard = len(self._hard)
+        self._dadt_buf = np.zeros(size)
+        self._dadt_per_hard = np.zeros((nhard, size))
+        if self.eccen is None:
+            self._dedt_buf = None
+            self._dedt_per_hard = None
+        else:
+            self._dedt_buf = np.zeros(size)
+            self._dedt_per_hard = np.zeros((nhard, size))
 
         if self._debug:    # nocov
+            # Store individual hardening rates, shaped (H, N, S) for H hardening models,
+            # each `_dadt_{ii}` and `_dedt_{ii}` attribute is a view into these arrays
+            self._dadt_per = np.zeros((len(self._hard),) + self.shape)
+            self._dedt_per = np.zeros_like(self._dadt_per)
             for ii, hard in enumerate(self._hard):
-                # Store individual hardening rates
-                setattr(self, f"_dadt_{ii}", np.zeros_like(self.dadt))
-                setattr(self, f"_dedt_{ii}", np.zeros_like(self.dadt))
+                setattr(self, f"_dadt_{ii}", self._dadt_per[ii])
+                setattr(self, f"_dedt_{ii}", self._dedt_per[ii])
 
         # ---- Initialize hardening rate at first step
         dadt_init, dedt_init = self._hardening_rate(step=0)
@@ -805,39 +876,51 @@ class Evolution:
 
         """
         # ---- Initialize
-        size, nsteps = self.shape
         left = step - 1     # the previous time-step (already completed)
         right = step        # the next     time-step
 
+        # local references to the evolution arrays, these are all updated in-place
+        tlook_arr = self.tlook
+        scafa_arr = self.scafa
+        dadt_arr = self.dadt
+        eccen_arr = self.eccen      # `None` if eccentricity is not being evolved
+        dedt_arr = self.dedt
+
         # get the separation $a$ on both edges
-        sepa = self.sepa[:, (right, left)]   # sepa is decreasing, so switch left-right order
+        sepa_l = self.sepa[:, left]
+        sepa_r = self.sepa[:, right]
 
         # ! ====================================================================
         # ---- Hardening rates at the left-edge of the step
-        # calculate
-        dadt_l, dedt_l = self._hardening_rate(left, store_debug=False)
-        da = np.diff(sepa, axis=-1)
-        da = da[:, 0]
-        dt = da / -dadt_l
+        # calculate; the state at step zero is unchanged since `_init_step_zero` stored its rates,
+        # while later left-edges have been updated by the previous step, and must be recalculated
+        if left == 0:
+            dadt_l = dadt_arr[:, left]
+            dedt_l = None if (eccen_arr is None) else dedt_arr[:, left]
+        else:
+            dadt_l, dedt_l = self._hardening_rate(left, store_debug=False)
+        # NOTE: sepa is decreasing, so swap the order in the difference, making `dt` positive
+        dt = np.subtract(sepa_r, sepa_l)
+        dt /= dadt_l
         if np.any(dt < 0.0):    # nocov
             err = f"Negative time-steps found at step={step}!"
             log.exception(err)
             raise ValueError(err)
 
-        if self.eccen is not None:
+        if eccen_arr is not None:
             de = dedt_l * dt
-            ecc_r = self.eccen[:, left] + de
-            ecc_r = np.clip(ecc_r, 0.0, 1.0 - _MAX_ECCEN_ONE_MINUS)
-            self.eccen[:, right] = ecc_r
+            ecc_r = eccen_arr[:, right]
+            np.add(eccen_arr[:, left], de, out=ecc_r)
+            np.clip(ecc_r, 0.0, 1.0 - _MAX_ECCEN_ONE_MINUS, out=ecc_r)
 
         # Update lookback time based on duration of this step
-        tlook = self.tlook[:, left] - dt
-        self.tlook[:, right] = tlook
+        tlook = tlook_arr[:, left] - dt
+        tlook_arr[:, right] = tlook
         # update scale-factor for systems at z > 0.0 (i.e. a < 1.0 and tlook > 0.0)
         val = (tlook > 0.0)
-        self.scafa[val, right] = cosmo.z_to_a(cosmo.tlbk_to_z(tlook[val]))
+        scafa_arr[val, right] = _tlbk_to_scafa(tlook[val], *self._tlbk_to_z_pchip)
         # set systems after z = 0 to scale-factor of unity
-        self.scafa[~val, right] = 1.0
+        scafa_arr[~val, right] = 1.0
         # ! ====================================================================
 
         # ---- Hardening rates at the right-edge of the step
@@ -845,47 +928,35 @@ class Evolution:
         dadt_r, dedt_r = self._hardening_rate(right, store_debug=True)
 
         # store
-        self.dadt[:, right] = dadt_r
-        if self.eccen is not None:
-            self.dedt[:, right] = dedt_r
+        dadt_arr[:, right] = dadt_r
+        if eccen_arr is not None:
+            dedt_arr[:, right] = dedt_r
 
-        # ---- Calculate time between edges
+        # ---- Calculate time between edges, and update right-edge lookback time and scale-factor
+        # NOTE/ENH: this would be a good place to make a function `_update_right_edge()` (or something like that),
+        # that stores the updated right edge values, and also performs any additional updates, such as mass evolution
 
-        # get the $dt/da$ rate on both edges of the step
-        dtda = 1.0 / - self.dadt[:, (left, right)]   # NOTE: `dadt` is negative, convert to positive
-        # use trapezoid rule to find total time for this step
-        dt = utils.trapz_loglog(dtda, sepa, axis=-1).squeeze()   # this should come out positive
+        # use trapezoid rule (in log-log space) to find total time for this step, this should come out positive
+        dt = _step_time_scafa(
+            sepa_l, sepa_r, dadt_arr[:, left], dadt_arr[:, right],
+            tlook_arr[:, left], tlook_arr[:, right], scafa_arr[:, right], *self._tlbk_to_z_pchip
+        )
         if np.any(dt < 0.0):    # nocov
             err = f"Negative time-steps found at step={step}!"
             log.exception(err)
             raise ValueError(err)
 
-        # ---- Update right-edge values
-        # NOTE/ENH: this would be a good place to make a function `_update_right_edge()` (or something like that),
-        # that stores the updated right edge values, and also performs any additional updates, such as mass evolution
-
-        # Update lookback time based on duration of this step
-        tlook = self.tlook[:, left] - dt
-        self.tlook[:, right] = tlook
-        # update scale-factor for systems at z > 0.0 (i.e. a < 1.0 and tlook > 0.0)
-        val = (tlook > 0.0)
-        self.scafa[val, right] = cosmo.z_to_a(cosmo.tlbk_to_z(tlook[val]))
-        # set systems after z = 0 to scale-factor of unity
-        self.scafa[~val, right] = 1.0
-
         # update eccentricity if it's being evolved
-        if self.eccen is not None:
-            dedt = self.dedt[:, (left, right)]
-            time = self.tlook[:, (right, left)]   # tlook is decreasing, so switch left-right order
-            # decc = utils.trapz_loglog(dedt, time, axis=-1).squeeze()
-            decc = utils.trapz(dedt, time, axis=-1).squeeze()
-            ecc_r = self.eccen[:, left] + decc
-            ecc_r = np.clip(ecc_r, 0.0, 1.0 - _MAX_ECCEN_ONE_MINUS)
-            self.eccen[:, right] = ecc_r
+        if eccen_arr is not None:
+            # trapezoid rule over the duration `dt` of this step
+            decc = 0.5 * (dedt_arr[:, left] + dedt_arr[:, right]) * dt
+            ecc_r = eccen_arr[:, right]
+            np.add(eccen_arr[:, left], decc, out=ecc_r)
+            np.clip(ecc_r, 0.0, 1.0 - _MAX_ECCEN_ONE_MINUS, out=ecc_r)
             if self._debug:    # nocov
                 bads = ~np.isfinite(decc)
                 if np.any(bads):
-                    utils.print_stats(print_func=log.error, dedt=dedt, time=time, decc=decc)
+                    utils.print_stats(print_func=log.error, dedt=dedt_arr[:, (left, right)], dt=dt, decc=decc)
                     err = f"Non-finite changes in eccentricity found in step {step}!"
                     log.exception(err)
                     raise ValueError(err)
@@ -896,12 +967,14 @@ class Evolution:
                 First, get total accretion rates """
 
             mdot_t = self._acc.mdot_total(self, step)
+            # allocate storage for accretion rates on first use
+            if self.mdot is None:
+                self.mdot = np.zeros(self.shape + (2,))
             """ A preferential accretion model is called to divide up
                 total accretion rates into primary and secondary accretion rates """
-            self.mdot[:,step-1,:] = self._acc.pref_acc(mdot_t, self, step)
+            self.mdot[:, left, :] = self._acc.pref_acc(mdot_t, self, step)
             """ Accreted mass is calculated and added to primary and secondary masses """
-            self.mass[:, step, 0] = self.mass[:, step-1, 0] + dt * self.mdot[:,step-1,0]
-            self.mass[:, step, 1] = self.mass[:, step-1, 1] + dt * self.mdot[:,step-1,1]
+            self.mass[:, right, :] = self.mass[:, left, :] + dt[:, np.newaxis] * self.mdot[:, left, :]
 
         return
 
@@ -930,18 +1003,24 @@ class Evolution:
             this is the hardening rate in eccentricity, $de/dt$, in units of [1/s].
             In this case, the shape is (N,) where N is the number of binaries.
 
+        Notes
+        -----
+        The returned arrays are scratch buffers that are overwritten by the next call to this
+        method, they must be used or copied before then.
+
         """
-        dadt = np.zeros(self.shape[0])
-        dedt = None if self.eccen is None else np.zeros_like(dadt)
+        dadt_per = self._dadt_per_hard
+        dedt_per = self._dedt_per_hard     # `None` if eccentricity is not being evolved
+        debug = self._debug
 
         for ii, hard in enumerate(self._hard):
             _hard_dadt, _ecc = hard.dadt_dedt(self, step)
-            dadt[:] += _hard_dadt
-            if self._debug:    # nocov
+            dadt_per[ii] = _hard_dadt
+            if debug:    # nocov
                 log.debug(f"{step} hard={hard} : dadt = {utils.stats(_hard_dadt)}")
                 # Store individual hardening rates
                 if store_debug:
-                    getattr(self, f"_dadt_{ii}")[:, step] = _hard_dadt[...]
+                    self._dadt_per[ii, :, step] = _hard_dadt
                 # Raise error on invalid entries
                 bads = ~np.isfinite(_hard_dadt) | (_hard_dadt > 0.0)
                 if np.any(bads):
@@ -953,12 +1032,13 @@ class Evolution:
                     log.error(f"BAD mass = {self.sepa[bads, step]}")
                     raise ValueError(err)
 
-            if (self.eccen is not None):
+            if dedt_per is not None:
                 if _ecc is None:
                     log.warning(f"`Evolution.eccen` is not None, but `dedt` is None!  {step} {hard}")
+                    dedt_per[ii] = 0.0
                     continue
-                dedt[:] += _ecc
-                if self._debug:    # nocov
+                dedt_per[ii] = _ecc
+                if debug:    # nocov
                     log.debug(f"{step} hard={hard} : dedt = {utils.stats(_ecc)}")
                     # Raise error on invalid entries
                     if not np.all(np.isfinite(_ecc)):
@@ -967,8 +1047,11 @@ class Evolution:
                         raise ValueError(err)
                     # Store individual hardening rates
                     if store_debug:
-                        getattr(self, f"_dedt_{ii}")[:, step] = _ecc[...]
+                        self._dedt_per[ii, :, step] = _ecc
 
+        # sum the contributions from all hardening models
+        dadt = np.sum(dadt_per, axis=0, out=self._dadt_buf)
+        dedt = None if (dedt_per is None) else np.sum(dedt_per, axis=0, out=self._dedt_buf)
         return dadt, dedt
 
     def _check(self):
@@ -980,7 +1063,7 @@ class Evolution:
         def check_vars(names):
             for cv in names:
                 vals = getattr(self, cv)
-                if np.any(~np.isfinite(vals)):    # pragma: no cover
+                if _any_nonfinite(vals):    # pragma: no cover
                     err = "Found non-finite '{}' !".format(cv)
                     raise ValueError(err)
 
@@ -1007,7 +1090,13 @@ class Evolution:
     def _update_derived(self):
         """Update any derived quantities after modifiers are applied.
         """
-        pass
+        # clear cached values, these will be recalculated from the modified values when needed
+        self._freq_orb_rest = None
+        self._freq_orb_obs = None
+        self._redz = None
+        self._xold_cache = dict()
+        self._scafa_nonfinite = None
+        return
 
     # ==== Properties and generic functionality
 
@@ -1061,8 +1150,13 @@ class Evolution:
             Mass ratio ($q = m_2/m_1 \\leq 1.0$).
 
         """
-        mass = np.moveaxis(self.mass, -1, 0)   # (N, M, 2) ==> (2, N, M)
-        mt, mr = utils.mtmr_from_m1m2(*mass)
+        # (N, M, 2) ==> (N, M) each
+        m1 = self.mass[..., 0]
+        m2 = self.mass[..., 1]
+        mt = m1 + m2
+        # NOTE: either component may be the larger one, matching `utils.mtmr_from_m1m2`
+        mr = np.minimum(m1, m2)
+        mr /= np.maximum(m1, m2)
         return mt, mr
 
     @property
@@ -1071,17 +1165,38 @@ class Evolution:
         """
         if self._freq_orb_rest is None:
             self._check_evolved()
+            # NOTE: masses may change over steps (e.g. from accretion or modifiers), so use all of them
             mtot = self.mass.sum(axis=-1)
             self._freq_orb_rest = utils.kepler_freq_from_sepa(mtot, self.sepa)
         return self._freq_orb_rest
 
+    @property
+    def redz(self):
+        """Redshift for each binary-step.
+
+        Derived from :attr:`Evolution.scafa`.
+
+        """
+        if self._redz is None:
+            self._check_evolved()
+            self._redz = cosmo.a_to_z(self.scafa)
+        return self._redz
+
     @property
     def freq_orb_obs(self):
         """Observer-frame orbital frequency. [1/s]
         """
-        redz = cosmo.a_to_z(self.scafa)
-        fobs = self.freq_orb_rest / (1.0 + redz)
-        return fobs
+        if self._freq_orb_obs is None:
+            self._freq_orb_obs = self.freq_orb_rest / (1.0 + self.redz)
+        return self._freq_orb_obs
+
+    @property
+    def _scafa_nonfinite_rows(self):
+        """Binaries with any non-finite scale-factor values, shape (N,).
+        """
+        if self._scafa_nonfinite is None:
+            self._scafa_nonfinite = ~np.all(np.isfinite(self.scafa), axis=-1)
+        return self._scafa_nonfinite
 
     def _check_evolved(self):
         """Raise an error if this instance has not yet been evolved.
@@ -1089,3 +1204,262 @@ class Evolution:
         if self._evolved is not True:
             raise RuntimeError("This instance has not been evolved yet!")
         return
+
+
+# =================================================================================================
+# ====    Numerical Kernels    ====
+# =================================================================================================
+
+
+@numba.njit(cache=True)
+def _trapz_loglog_2pt(x0, x1, y0, y1):
+    """Integrate between two points using the trapezoid rule in log-log space.
+
+    Equivalent to ``utils.trapz_loglog([y0, y1], [x0, x1])`` for scalar values, i.e. `y` is
+    assumed to be a power-law in `x` between the two points.
+
+    Parameters
+    ----------
+    x0, x1 : float
+        Integration variable at the lower and upper points.
+    y0, y1 : float
+        Integrand at the lower and upper points.
+
+    Returns
+    -------
+    integ : float
+        Integral between the two points.
+
+    """
+    delta_logx = np.log(x1) - np.log(x0)
+    gamma = (np.log(y1) - np.log(y0)) / delta_logx
+    # when the power-law is (near) '-1' then, `A = a * log(x1/x0)`
+    if abs(gamma + 1.0) <= 2.0 * _TRAPZ_LOGLOG_LNTOL:
+        return 0.5 * (x0 * y0 + x1 * y1) * delta_logx
+
+    return (x1 * y1 - x0 * y0) / (gamma + 1.0)
+
+
+@numba.njit(parallel=True, cache=True)
+def _step_time_scafa(sepa_l, sepa_r, dadt_l, dadt_r, tlook_l, tlook_r, scafa_r, xx, cc):
+    """Find the duration of a step for each binary, and update the right-edge lookback time and scale-factor.
+
+    The duration is found by integrating ``dt/da = -1/(da/dt)`` over the step with
+    `_trapz_loglog_2pt`, the lookback time is decreased by that duration, and the scale-factor is
+    found from the new lookback time using `_tlbk_to_scafa_1`.  Systems past redshift zero
+    (``tlook_r <= 0.0``) are given a scale-factor of unity.
+
+    Parameters
+    ----------
+    sepa_l, sepa_r : (N,) ndarray
+        Separations at the left and right edges of the step [cm].
+    dadt_l, dadt_r : (N,) ndarray
+        Hardening rates at the left and right edges of the step [cm/s], must be negative.
+    tlook_l : (N,) ndarray
+        Lookback times at the left edge of the step [sec].
+    tlook_r : (N,) ndarray
+        Output: lookback times at the right edge of the step [sec].
+    scafa_r : (N,) ndarray
+        Output: scale-factors at the right edge of the step.
+    xx, cc : ndarray
+        Breakpoints and coefficients of the lookback-time to redshift interpolant, see `_tlbk_to_scafa`.
+
+    Returns
+    -------
+    dt : (N,) ndarray
+        Duration of the step for each binary [sec], should be positive.
+
+    """
+    size = sepa_l.size
+    dt = np.empty(size)
+    for ii in numba.prange(size):
+        # NOTE: `dadt` is negative, convert to positive
+        # NOTE: the (right, left) ordering of separations matches the original `utils.trapz_loglog` usage
+        dt[ii] = _trapz_loglog_2pt(sepa_r[ii], sepa_l[ii], 1.0 / -dadt_l[ii], 1.0 / -dadt_r[ii])
+        tt = tlook_l[ii] - dt[ii]
+        tlook_r[ii] = tt
+        # update scale-factor for systems at z > 0.0 (i.e. a < 1.0 and tlook > 0.0)
+        if tt > 0.0:
+            scafa_r[ii] = _tlbk_to_scafa_1(tt, xx, cc)
+        # set systems after z = 0 to scale-factor of unity
+        else:
+            scafa_r[ii] = 1.0
+
+    return dt
+
+
+@numba.njit(cache=True)
+def _any_nonfinite(arr):
+    """Check whether any element of the given array is non-finite, returning at the first one found.
+
+    Equivalent to ``np.any(~np.isfinite(arr))``, without constructing a boolean array.
+
+    """
+    for val in arr.flat:
+        if not np.isfinite(val):
+            return True
+
+    return False
+
+
+@numba.njit(parallel=True, cache=True)
+def _searchsorted_rows(xold, xnew):
+    """Find the indices in each row of `xold` bounding each of the target values `xnew`.
+
+    Each row of `xold` must be in increasing order.  The 'after' index is the first index whose
+    value is at or above the target, and the 'before' index is the one preceding it.  Targets not
+    bounded by a row (i.e. above its last finite value, or at/below its first value) are given
+    indices of zero.
+
+    Parameters
+    ----------
+    xold : (N, M) ndarray
+        Increasing values along the last axis, for each of N binaries.
+    xnew : (T,) ndarray
+        Target values to locate in each row.
+
+    Returns
+    -------
+    cut_idx : (2, N, T) ndarray of int
+        Indices into the last axis of `xold` for each binary and each target.  The 0th element is
+        the 'after' index, and the 1th element is the 'before' index.
+
+    """
+    nbins, nsteps = xold.shape
+    ntarg = xnew.size
+    cut_idx = np.zeros((2, nbins, ntarg), dtype=np.int64)
+    for ii in numba.prange(nbins):
+        row = xold[ii]
+        idx = np.searchsorted(row, xnew)
+        for jj in range(ntarg):
+            kk = idx[jj]
+            # NaN values sort to the end of the row, and are never 'after' a target
+            if (kk < nsteps) and (xnew[jj] <= row[kk]) and (kk > 0):
+                cut_idx[0, ii, jj] = kk
+                cut_idx[1, ii, jj] = kk - 1
+
+    return cut_idx
+
+
+@numba.njit(parallel=True, cache=True)
+def _interp_gather(yolds, rows, aft_idx, bef_step, frac, log_flags):
+    """Interpolate evolution data to fractional step locations, for each binary.
+
+    For binary `i`, target `j` and component `k`, the returned value is
+    ``y[i, lo, k] + (y[i, hi, k] - y[i, lo, k]) * frac[i, j]``, where ``hi = aft_idx[i, j]`` and
+    ``lo = hi + bef_step`` is the adjacent step (limited to the range of steps).  Components whose
+    `log_flags` value is True are interpolated in ``log(y)``, and converted back to linear space.
+    Binaries which are not selected by `rows` are set to `np.nan`, without reading their data.
+
+    Parameters
+    ----------
+    yolds : tuple of (N, M, K_p) ndarray
+        Evolution data for each parameter, for N binaries, M steps, and K_p components
+        (e.g. K_p=2 for `mass`).
+    rows : (N,) ndarray of bool
+        Which binaries to interpolate.
+    aft_idx : (N, T) ndarray of int
+        Step indices to interpolate towards, for each target.
+    bef_step : int
+        Offset (-1 or +1) from `aft_idx` to the step to interpolate from.
+    frac : (N, T) ndarray
+        Fractional distance to go from the 'before' step towards `aft_idx`.
+    log_flags : (K,) ndarray of bool
+        Whether to interpolate each component, of all parameters, in log-space (True) or
+        linear-space (False).  Here `K` is the sum of all `K_p`.
+
+    Returns
+    -------
+    ynew : (K, N, T) ndarray
+        Interpolated values, with each component stored as a contiguous (N, T) plane.
+
+    """
+    nbins, ntarg = frac.shape
+    last = yolds[0].shape[1] - 1
+    ynew = np.empty((log_flags.size, nbins, ntarg))
+    for ii in numba.prange(nbins):
+        if not rows[ii]:
+            ynew[:, ii, :] = np.nan
+            continue
+
+        for jj in range(ntarg):
+            hi = aft_idx[ii, jj]
+            lo = min(max(hi + bef_step, 0), last)
+            ff = frac[ii, jj]
+            out = 0
+            for pp in range(len(yolds)):
+                yold = yolds[pp]
+                for kk in range(yold.shape[2]):
+                    y0 = yold[ii, lo, kk]
+                    y1 = yold[ii, hi, kk]
+                    if log_flags[out]:
+                        # base-2 is equivalent to base-10 here, but cheaper to evaluate
+                        y0 = np.log2(y0)
+                        y1 = np.log2(y1)
+                        ynew[out, ii, jj] = np.exp2(y0 + (y1 - y0) * ff)
+                    else:
+                        ynew[out, ii, jj] = y0 + (y1 - y0) * ff
+                    out += 1
+
+    return ynew
+
+
+@numba.njit(cache=True)
+def _tlbk_to_scafa(tlook, xx, cc):
+    """Convert lookback times to scale-factors, using a piecewise-polynomial interpolant of redshift.
+
+    Equivalent to ``cosmo.z_to_a(cosmo.tlbk_to_z(tlook))``, where the `cosmo.tlbk_to_z` interpolant
+    (``PchipInterpolator(..., extrapolate=False)``) is given by its breakpoints `xx` and
+    coefficients `cc`.  Lookback times outside of the interpolation range return `np.nan`.
+
+    Parameters
+    ----------
+    tlook : (N,) ndarray
+        Lookback times [sec].
+    xx : (M,) ndarray
+        Breakpoints of the interpolant, i.e. lookback times in increasing order [sec].
+    cc : (K, M-1) ndarray
+        Polynomial coefficients of redshift in each interval, highest order first.
+
+    Returns
+    -------
+    scafa : (N,) ndarray
+        Scale-factors.
+
+    """
+    size = tlook.size
+    scafa = np.empty(size)
+    for ii in range(size):
+        scafa[ii] = _tlbk_to_scafa_1(tlook[ii], xx, cc)
+
+    return scafa
+
+
+@numba.njit(cache=True)
+def _tlbk_to_scafa_1(tt, xx, cc):
+    """Convert a single lookback time to a scale-factor, see `_tlbk_to_scafa`.
+    """
+    last = xx.size - 1
+    korder = cc.shape[0]
+    # NOTE: this also catches `nan` values
+    if not ((tt >= xx[0]) and (tt <= xx[last])):
+        return np.nan
+
+    # bisect for the interval `jj` such that ``xx[jj] <= tt < xx[jj+1]`` (or the last interval)
+    # NOTE: written without branches on the comparison, which is unpredictable for unsorted inputs
+    lo = 0
+    num = last
+    while num > 1:
+        half = num // 2
+        lo = lo + half * (xx[lo + half] <= tt)
+        num -= half
+    jj = lo
+    dx = tt - xx[jj]
+    # sum terms from lowest to highest order, as done by `scipy.interpolate.PPoly`
+    redz = 0.0
+    zz = 1.0
+    for kk in range(korder):
+        redz += cc[korder - kk - 1, jj] * zz
+        zz *= dx
+
+    return 1.0 / (1.0 + redz)
@@ -428,6 +428,56 @@ class Test_Evolution_Advanced:
 
         return
 
+    def test_at_sepa_mass_order(self, evo_def):
+        """Without accretion, interpolated masses must match the initial masses, component-wise.
+        """
+        evo = evo_def
+        sepa = np.logspace(-1, 3, 8) * PC
+        mass = evo.at('sepa', sepa, params='mass')['mass']
+        # (N, X, 2) compare to initial masses, shaped (N, 1, 2)
+        assert np.allclose(mass, evo.mass[:, :1, :])
+
+        return
+
+    def test_at_scalar_target(self, evo_def):
+        """A scalar target should remove only the target dimension.
+        """
+        evo = evo_def
+        fobs = 1.0 / YR
+        vals = evo.at('fobs', fobs, params=['mass', 'sepa'])
+        check = evo.at('fobs', [fobs], params=['mass', 'sepa'])
+        assert vals['sepa'].shape == (evo.size,)
+        assert vals['mass'].shape == (evo.size, 2)
+        assert np.array_equal(vals['sepa'], check['sepa'][:, 0], equal_nan=True)
+        assert np.array_equal(vals['mass'], check['mass'][:, 0, :], equal_nan=True)
+        return
+
+    def test_at_sepa_self(self, evo_def):
+        """Interpolating `sepa` to separation targets should just return the targets.
+        """
+        evo = evo_def
+        sepa = np.array([1e6, 1.0, 1e-8]) * PC
+        vals = evo.at('sepa', sepa, params=['sepa'])
+        check = evo.at('sepa', sepa, params=['sepa', 'scafa'])
+        assert list(vals.keys()) == ['sepa']
+        assert np.array_equal(np.isnan(vals['sepa']), np.isnan(check['sepa']))
+        assert np.allclose(vals['sepa'], check['sepa'], equal_nan=True)
+
+        return
+
+    def test_sample_universe_bootstrap(self, evo_def):
+        fobs_orb_edges = np.logspace(-9, -7, 6)
+        names, samples, vals, weights = evo_def.sample_universe(fobs_orb_edges, down_sample=1e6, kde=False)
+        assert samples.shape[0] == len(names) == vals.shape[0]
+        assert samples.shape[1] > 0
+        # without a KDE, every sample must be one of the binary values
+        vals = {tuple(vv) for vv in vals.T}
+        assert all(tuple(ss) in vals for ss in samples.T)
+        fobs = samples[names.index('fobs')]
+        assert np.all((fobs_orb_edges[0] < fobs) & (fobs < fobs_orb_edges[-1]))
+
+        return
+
 
 def mockup_modified():
 
@@ -488,6 +538,62 @@ class Test_Modified:
         assert np.all(evo.mass == 0.0)
         return
 
+    def test_freq_orb_rest_modified_masses(self):
+        """Make sure orbital frequencies use per-step masses, after a modifier changes them.
+        """
+        evo = mockup_modified()
+
+        class Grow(holo.utils._Modifier):
+
+            def modify(self, base):
+                base.mass[...] = MSOL * np.linspace(1.0e6, 1.0e9, base.steps)[np.newaxis, :, np.newaxis]
+
+        evo.evolve()
+        evo.modify(Grow())
+        assert not np.all(evo.mass == evo.mass[:, :1, :])
+        truth = holo.utils.kepler_freq_from_sepa(evo.mass.sum(axis=-1), evo.sepa)
+        assert np.allclose(evo.freq_orb_rest, truth, rtol=1e-12, atol=0.0)
+        return
+
+
+def test_eccen_step_uses_own_duration():
+    """Each binary's eccentricity change must be integrated over its own step duration.
+
+    Binaries start from the same separation and eccentricity, but harden at different (constant)
+    rates, so their step durations differ.  With a constant de/dt, the change in eccentricity over
+    each step must then be `dedt * dt` using that binary's own `dt`.
+
+    """
+    SIZE = 5
+    DEDT = -2.0e-4 / YR
+    rates = np.linspace(1.0, 5.0, SIZE)
+
+    class Pop(population._Population_Discrete):
+        def _init(self):
+            self.mass = np.full((SIZE, 2), 1.0e8 * MSOL)
+            self.sepa = np.full(SIZE, 1.0e3 * PC)
+            self.scafa = np.full(SIZE, 0.5)
+            self.eccen = np.full(SIZE, 0.5)
+            return
+
+    class Hard(holo.hardening._Hardening):
+        def dadt_dedt(self, evo, step, *args, **kwargs):
+            dadt = -(PC/YR) * rates
+            dedt = DEDT * np.ones(evo.size)
+            return dadt, dedt
+
+    evo = evolution.Evolution(Pop(), Hard(), nsteps=10)
+    evo.evolve()
+
+    # with a constant hardening rate, the duration of each step is exactly `da / |da/dt|`
+    dt = -np.diff(evo.sepa, axis=-1) / (rates[:, np.newaxis] * PC / YR)
+    de = np.diff(evo.eccen, axis=-1)
+    # step durations must differ between binaries for this test to be meaningful
+    assert not np.allclose(dt[0], dt[-1])
+    assert np.all(evo.eccen[:, -1] > 0.0)
+    assert np.allclose(de, DEDT * dt, rtol=1e-6, atol=1e-12)
+    return
+
 
 # ==============================================================================
 # ====    Hardening Classes and Functions    ====
@@ -517,6 +623,24 @@ class Test_Hardening_Generic:
         Hard_Succeed()
         return
 
+    def test_is_hardening(self):
+        class Hard_Succeed(holo.hardening._Hardening):
+            def dadt_dedt(self, evo, step):   # nocov
+                pass
+
+        # both subclasses and their instances are recognized
+        for hh in [Hard_Succeed, Hard_Succeed(), holo.hardening.Hard_GW, holo.hardening.Hard_GW()]:
+            assert holo.hardening.is_hardening(hh)
+
+        for hh in [None, 1.0, object, object(), "Hard_GW"]:
+            assert not holo.hardening.is_hardening(hh)
+
+        with pytest.raises(TypeError, match="must be subclass of"):
+            pop = holo.discrete.population.Pop_Illustris()
+            holo.discrete.evolution.Evolution(pop, object())
+
+        return
+
     def test_simplest_subclass(self, simplest):
         evo = simplest
         evo.evolve()
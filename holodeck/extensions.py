@@ -148,7 +148,7 @@ class Realizer_SAM:
         names = ['mtot', 'mrat', 'redz', 'fobs']
         number = number.flatten()
         shape = (number.size, nreals)
-        weights = gravwaves.poisson_as_needed(number[..., np.newaxis] * np.ones(shape)).reshape(shape)
+        weights = gravwaves.poisson_as_needed(number[..., np.newaxis], size=shape)
 
 
 
@@ -6,6 +6,7 @@ and not the semi-analytic or observational population models.
 
 """
 
+from multiprocessing import cpu_count, get_context
 from typing import Any
 import numba
 import numpy as np
@@ -16,8 +17,17 @@ import holodeck as holo
 from holodeck import utils, cosmo, log, hardening
 from holodeck.constants import SPLC, NWTG, MPC
 
+# the compiled extension is optional here, fall back to pure-python when it has not been built,
+# or when it is a stale build that does not yet provide `gw_freq_dist_func`
+try:
+    from holodeck import cyutils as _cyutils
+except ImportError:
+    _cyutils = None
+_cy_gw_freq_dist_func = getattr(_cyutils, 'gw_freq_dist_func', None)
 
 _CALC_MC_PARS = ['mass', 'sepa', 'dadt', 'scafa', 'eccen']
+#: maximum number of binary-target values interpolated together (per parameter) in `GW_Discrete.emit`
+_EMIT_INTERP_MAX_SIZE = 2**24
 
 
 class Grav_Waves:
@@ -41,7 +51,37 @@ class GW_Discrete(Grav_Waves):
         self._box_vol_cgs = self._bin_evo._sample_volume
         return
 
-    def emit(self, eccen=None, stats=False, progress=True, nloudest=5):
+    def emit(self, eccen=None, stats=False, progress=True, nloudest=5, nproc=1, dtype=np.float64):
+        """Calculate the GW signals from the binary population at each frequency.
+
+        Parameters
+        ----------
+        eccen : bool or None
+            Whether to include eccentric harmonics.  If `None`, eccentric harmonics are used when
+            the binary evolution includes eccentricities.
+        stats : bool
+            Unused.
+        progress : bool
+            Whether to show a progress bar (when running serially).
+        nloudest : int
+            Number of loudest binaries to store in each frequency bin and realization.
+        nproc : int or None
+            Number of processes to calculate frequencies with.  If `None`, use all available cores.
+            If `1`, run serially.  When running in parallel, each chunk of frequencies draws random
+            numbers from its own seed (drawn from the global `np.random` state), so results are
+            reproducible but differ from those of a serial calculation.  Worker processes are
+            started with the 'forkserver' method, so calling scripts must be protected by an
+            ``if __name__ == "__main__":`` guard.  The forkserver context is shared by the whole
+            process, so its preload list is left untouched; workers import `holodeck` when first
+            used.
+        dtype : data-type
+            Floating-point type of the Poisson-sampled numbers of binaries and the strains that
+            they are multiplied with.  `np.float32` halves the memory used by these (binaries x
+            realizations) arrays, at the cost of precision (e.g. squared strains below ~1e-38
+            become subnormal).  The per-source physics and the sums over binaries always use
+            `np.float64`.
+
+        """
         fobs_gw = self.fobs_gw
         nfreqs = fobs_gw.size
         nharms = self.nharms
@@ -61,26 +101,43 @@ class GW_Discrete(Grav_Waves):
         both = np.zeros((nfreqs, nreals))
 
         if eccen:
-            harm_range = range(1, nharms+1)
+            harm_range = np.arange(1, nharms+1)
         else:
-            harm_range = [2]
+            harm_range = np.array([2])
 
         harms = np.zeros((nfreqs, nharms))
 
-        freq_iter = enumerate(fobs_gw)
-        freq_iter = utils.tqdm(freq_iter, total=len(fobs_gw), desc='GW frequencies') if progress else freq_iter
-        for ii, fogw in freq_iter:
-            lo = fobs_gw[0] if (ii == 0) else fobs_gw[ii-1]
-            hi = fobs_gw[1] if (ii == 0) else fobs_gw[ii]
-            dlnf = np.log(hi) - np.log(lo)
-            _both, _fore, _back, _loud, _gwb_harms = _gws_harmonics_at_evo_fobs(
-                fogw, dlnf, bin_evo, harm_range, nreals, box_vol, loudest=nloudest
-            )
-            loudest[ii, :] = _loud
-            both[ii, :] = _both
-            fore[ii, :] = _fore
-            back[ii, :] = _back
-            harms[ii, :] = _gwb_harms
+        # Interpolate binaries to the harmonics of several frequencies at once, in chunks of
+        # `nchunk` frequencies to limit the size of the interpolated arrays
+        nchunk = max(1, _EMIT_INTERP_MAX_SIZE // (bin_evo.size * harm_range.size))
+        if nproc is None:
+            nproc = cpu_count()
+        nproc = min(nproc, nfreqs)
+        if nproc > 1:
+            # make sure there are enough chunks for all processes
+            nchunk = min(nchunk, int(np.ceil(nfreqs / nproc)))
+        bounds = [(lo, min(lo + nchunk, nfreqs)) for lo in range(0, nfreqs, nchunk)]
+        args = (fobs_gw, bin_evo, harm_range, nreals, box_vol, nloudest, dtype)
+
+        if nproc > 1:
+            seeds = np.random.randint(0, 2**32, size=len(bounds), dtype=np.int64)
+            tasks = [bb + args + (seed,) for bb, seed in zip(bounds, seeds)]
+            # NOTE: workers are not forked from this process, as forking after numba's parallel
+            #       (e.g. TBB) threads have started can deadlock
+            ctx = get_context('forkserver')
+            with ctx.Pool(nproc) as pool:
+                results = pool.starmap(_gws_harmonics_at_evo_fobs_range, tasks)
+        else:
+            # only redraw the progress bar occasionally, as each frequency can be fast
+            pbar = utils.tqdm(
+                total=nfreqs, desc='GW frequencies', mininterval=0.5, miniters=max(1, nfreqs // 200),
+            ) if progress else None
+            results = [_gws_harmonics_at_evo_fobs_range(*bb, *args, pbar=pbar) for bb in bounds]
+            if pbar is not None:
+                pbar.close()
+
+        for (lo, hi), res in zip(bounds, results):
+            both[lo:hi], fore[lo:hi], back[lo:hi], loudest[lo:hi], harms[lo:hi] = res
 
         self.both = np.sqrt(both)
         self.fore = np.sqrt(fore)
@@ -150,7 +207,69 @@ class LISA:
         return self.is_above_hc_curve(ff, hc)
 
 
-def _gws_harmonics_at_evo_fobs(fobs_gw, dlnf, evo, harm_range, nreals, box_vol, loudest=5):
+def _gws_harmonics_at_evo_fobs_range(lo, hi, fobs_gw, evo, harm_range, nreals, box_vol, loudest,
+                                     dtype=np.float64, seed=None, pbar=None):
+    """Calculate GW signals for a contiguous range of observer-frame GW frequencies.
+
+    Binaries are interpolated to the harmonics of all frequencies in the range at once, and then
+    `_gws_harmonics_at_evo_fobs` is called for each frequency.
+
+    Parameters
+    ----------
+    lo, hi : int
+        Indices of the first and (one past the) last frequency in `fobs_gw` to calculate.
+    fobs_gw : (F,) ndarray
+        All observer-frame GW-frequencies in units of [1/sec], used to find the bin widths.
+    evo, harm_range, nreals, box_vol, loudest, dtype :
+        See `_gws_harmonics_at_evo_fobs`.
+    seed : int or None
+        If given, the seed for the global `np.random` state, used when running in a new process.
+    pbar : `tqdm.tqdm` or None
+        Progress bar to update after each frequency.
+
+    Returns
+    -------
+    both, fore, back : (C, R) ndarray
+    loud : (C, L, R) ndarray
+    gwb_harms : (C, H) ndarray
+        The outputs of `_gws_harmonics_at_evo_fobs` for each of the `C` frequencies.
+
+    """
+    if seed is not None:
+        np.random.seed(seed)
+
+    num = hi - lo
+    nh = harm_range.size
+    both = np.zeros((num, nreals))
+    fore = np.zeros((num, nreals))
+    back = np.zeros((num, nreals))
+    loud = np.zeros((num, loudest, nreals))
+    gwb_harms = np.zeros((num, nh))
+
+    # (C*H,) observer-frame orbital-frequency for each harmonic of each frequency
+    fobs_orb = fobs_gw[lo:hi, np.newaxis] / harm_range[np.newaxis, :]
+    data_chunk = evo.at('fobs', fobs_orb.ravel(), params=_CALC_MC_PARS)
+
+    for jj, ii in enumerate(range(lo, hi)):
+        # select the (N, H) values for this frequency
+        cut = slice(jj*nh, (jj+1)*nh)
+        data_harms = {kk: None if vv is None else vv[:, cut] for kk, vv in data_chunk.items()}
+
+        flo = fobs_gw[0] if (ii == 0) else fobs_gw[ii-1]
+        fhi = fobs_gw[1] if (ii == 0) else fobs_gw[ii]
+        dlnf = np.log(fhi) - np.log(flo)
+        both[jj], fore[jj], back[jj], loud[jj], gwb_harms[jj] = _gws_harmonics_at_evo_fobs(
+            fobs_gw[ii], dlnf, evo, harm_range, nreals, box_vol, loudest=loudest,
+            data_harms=data_harms, dtype=dtype,
+        )
+        if pbar is not None:
+            pbar.update()
+
+    return both, fore, back, loud, gwb_harms
+
+
+def _gws_harmonics_at_evo_fobs(fobs_gw, dlnf, evo, harm_range, nreals, box_vol, loudest=5, data_harms=None,
+                               dtype=np.float64):
     """Calculate GW signal at range of frequency harmonics for a single observer-frame GW frequency.
 
     Parameters
@@ -174,6 +293,13 @@ def _gws_harmonics_at_evo_fobs(fobs_gw, dlnf, evo, harm_range, nreals, box_vol,
         Volume of the simulation box that the binary population is derived from.  Units of [cm^3].
     loudest : int
         Number of 'loudest' (highest amplitude) strain values to calculate and return separately.
+    data_harms : dict or None
+        Binary parameters (`_CALC_MC_PARS`) already interpolated to the harmonics of this frequency,
+        i.e. the output of ``evo.at('fobs', fobs_gw / harm_range, params=_CALC_MC_PARS)``.
+        If `None`, the interpolation is performed here.
+    dtype : data-type
+        Floating-point type of the (V, R) Poisson-sampled numbers of binaries, and of the strains
+        they are multiplied with.  Sums over binaries are always accumulated in `np.float64`.
 
     Returns
     -------
@@ -195,7 +321,8 @@ def _gws_harmonics_at_evo_fobs(fobs_gw, dlnf, evo, harm_range, nreals, box_vol,
     # (H,) observer-frame orbital-frequency for each harmonic
     fobs_orb = fobs_gw / harm_range
     # Each parameter will be (N, H) = (binaries, harmonics)
-    data_harms = evo.at('fobs', fobs_orb, params=_CALC_MC_PARS)
+    if data_harms is None:
+        data_harms = evo.at('fobs', fobs_orb, params=_CALC_MC_PARS)
 
     # Only examine binaries reaching the given locations before redshift zero (other redz=inifinite)
     # (N, H)
@@ -205,8 +332,8 @@ def _gws_harmonics_at_evo_fobs(fobs_gw, dlnf, evo, harm_range, nreals, box_vol,
     # There are 'V' valid == True elements of the (N, H) arrays, such that V <= N*H
     # anytime an (N, H) ndarray is sliced by the `valid` ndarray, it results in a (V,) ndarray
 
-    # Broadcast harmonics numbers to correct shape, (N, H)
-    harms_2d = np.ones_like(redz, dtype=int) * harm_range[np.newaxis, :]
+    # Broadcast harmonics numbers to correct shape, (N, H); this is a (read-only) view
+    harms_2d = np.broadcast_to(harm_range[np.newaxis, :], redz.shape)
     harms_1d = harms_2d[valid]
 
     # ---- Handle Eccentricities and eccentricity distribution function
@@ -216,28 +343,29 @@ def _gws_harmonics_at_evo_fobs(fobs_gw, dlnf, evo, harm_range, nreals, box_vol,
     # for circular binaries, we should only be consider the n=2 harmonic, and gne(n=2)=1.0
     if eccen is None:
         gne = 1
-        assert np.all(harms_2d == 2)
+        assert np.all(harm_range == 2)
 
     # If there are eccentricities, calculate the freq-dist-function
     else:
         # (V,) array [i.e. the `valid` slice of (N, H)]
         eccen = eccen[valid]
-        gne = utils.gw_freq_dist_func(harms_1d, ee=eccen)
+        # the compiled version handles (near-)zero eccentricities itself
+        if _cy_gw_freq_dist_func is not None:
+            gne = _cy_gw_freq_dist_func(harms_1d, eccen)
+        else:
+            gne = utils.gw_freq_dist_func(harms_1d, ee=eccen)
 
-        # Handle (near-)zero eccentricities manually
-        # when eccentricity is very low, set all harmonics to zero except for n=2
+            # Handle (near-)zero eccentricities manually
+            # when eccentricity is very low, set all harmonics to zero except for n=2
 
-        # Select the elements corresponding to the n=2 (circular) harmonic, to use later
-        # (N, H)
-        sel_n2 = np.zeros_like(redz, dtype=bool)
-        sel_n2[(harms_2d == 2)] = 1
-        # (V,)
-        sel_n2 = sel_n2[valid]
+            # Select the elements corresponding to the n=2 (circular) harmonic, to use later
+            # (V,)
+            sel_n2 = (harms_1d == 2)
 
-        # Select near-zero eccentricities and set the gne values manually
-        sel_e0 = (eccen < 1e-12)
-        gne[sel_e0] = 0.0
-        gne[sel_n2 & sel_e0] = 1.0
+            # Select near-zero eccentricities and set the gne values manually, in a single pass:
+            # 1.0 for the n=2 harmonic, and 0.0 otherwise
+            sel_e0 = (eccen < 1e-12)
+            np.copyto(gne, sel_n2, where=sel_e0)
 
     # ---- Calculate GWB
 
@@ -246,10 +374,12 @@ def _gws_harmonics_at_evo_fobs(fobs_gw, dlnf, evo, harm_range, nreals, box_vol,
     redz = redz[valid]
     frst_orb = frst_orb[valid]
     # Calculate required parameters for valid binaries (V,)
-    dcom = cosmo.z_to_dcom(redz)
+    # (equivalent to `cosmo.z_to_dcom`, but reusing the same interpolant for every frequency)
+    dcom = utils.cosmo_pchip(cosmo, '_grid_z', '_grid_dcom', '_sort_z')(redz)
 
-    mchirp = data_harms['mass'][valid]
-    mchirp = utils.chirp_mass(*mchirp.T)
+    # select each component mass separately, giving contiguous (V,) arrays for `chirp_mass`
+    mass = data_harms['mass']
+    mchirp = utils.chirp_mass(mass[..., 0][valid], mass[..., 1][valid])
     # Calculate strains from each source
     hs2 = utils.gw_strain_source(mchirp, dcom, frst_orb)**2
 
@@ -257,33 +387,98 @@ def _gws_harmonics_at_evo_fobs(fobs_gw, dlnf, evo, harm_range, nreals, box_vol,
     _lambda_fact = utils.lambda_factor_dlnf(frst_orb, dfdt, redz, dcom=dcom) / box_vol
     num_binaries = _lambda_fact * dlnf
 
+    # if there are no binaries at this frequency (e.g. none are 'valid'), there is no signal;
+    # skip the sampling, which would only draw zeros (without using the random state)
+    if np.all(num_binaries == 0.0):
+        both = np.zeros(nreals)
+        loud = np.zeros((loudest, nreals))
+        return both, both.copy(), both.copy(), loud, np.zeros(harm_range.size)
+
     shape = (num_binaries.size, nreals)
-    num_pois = poisson_as_needed(num_binaries[:, np.newaxis] * np.ones(shape))
+    num_pois = poisson_as_needed(num_binaries[:, np.newaxis], size=shape, dtype=dtype)
 
     # --- Calculate GW Signals
-    temp = hs2 * gne * (2.0 / harms_1d)**2
-    both = np.sum(temp[:, np.newaxis] * num_pois / dlnf, axis=0)
+    # (2/n)^2 is only calculated once for each harmonic, and then looked up by harmonic number
+    harm_fact = np.zeros(harm_range.max() + 1)
+    harm_fact[harm_range] = np.square(2.0 / harm_range)
+    # (V,) combine the strain factors in place, `hs2` is not used again
+    temp = hs2
+    temp *= gne
+    temp *= harm_fact[harms_1d]
+    # (V,) x (V, R) ==> (R,) sum over binaries, and (L, R) loudest binaries in each realization,
+    # in a single pass over `num_pois`.  NOTE: at least one is needed for the foreground
+    both, loud = _poisson_strains_loudest(temp.astype(dtype, copy=False), num_pois, max(loudest, 1))
+    both /= dlnf
 
     # Calculate and return the expectation value hc^2 for each harmonic
     # (N, H)
-    gwb_harms = np.zeros_like(harms_2d, dtype=float)
+    gwb_harms = np.zeros(harms_2d.shape)
     gwb_harms[valid] = temp * num_binaries / dlnf
     # (N, H) ==> (H,)
     gwb_harms = np.sum(gwb_harms, axis=0)
 
-    if np.any(num_pois > 0):
-        # Find the L loudest binaries in each realizations
-        loud = np.sort(temp[:, np.newaxis] * (num_pois > 0), axis=0)[::-1, :]
-        fore = loud[0, :]
-        loud = loud[:loudest, :]
-    else:
-        fore = np.zeros_like(both)
-        loud = np.zeros((loudest, nreals))
+    # the loudest binary in each realization is the foreground, zero if there are no binaries
+    fore = loud[0, :]
+    loud = loud[:loudest, :]
 
     back = both - fore
     return both, fore, back, loud, gwb_harms
 
 
+@numba.njit(parallel=True, cache=True)
+def _poisson_strains_loudest(temp, num_pois, nloud):
+    """Sum the Poisson-sampled strains, and find the loudest binaries, in each realization.
+
+    Equivalent to ``np.sum(temp[:, np.newaxis] * num_pois, axis=0)`` and the first `nloud` rows of
+    ``np.sort(temp[:, np.newaxis] * (num_pois > 0), axis=0)[::-1]``, but without any (V, R)
+    temporaries or sorting.
+
+    Parameters
+    ----------
+    temp : (V,) ndarray
+        Squared-strain contribution from a single binary, for each binary-harmonic.
+    num_pois : (V, R) ndarray
+        Number of binaries for each binary-harmonic, in each realization.
+    nloud : int
+        Number of loudest binaries to find.
+
+    Returns
+    -------
+    both : (R,) ndarray
+        Total squared-strain from all binaries, in each realization.
+    loud : (L, R) ndarray
+        Largest `temp` values with non-zero numbers of binaries, in decreasing order, in each
+        realization.  Zero when there are fewer than `L` such binaries.
+
+    """
+    nvals, nreals = num_pois.shape
+    both = np.zeros(nreals)
+    loud = np.zeros((nloud, nreals))
+    last = nloud - 1
+    # blocks of realizations are handled in parallel, with a contiguous inner loop over each block
+    block = 16
+    nblocks = (nreals + block - 1) // block
+    for bb in numba.prange(nblocks):
+        lo = bb * block
+        hi = min(lo + block, nreals)
+        for vv in range(nvals):
+            tt = temp[vv]
+            for rr in range(lo, hi):
+                num = num_pois[vv, rr]
+                if num <= 0.0:
+                    continue
+                both[rr] += tt * num
+                # insert into the (decreasing) loudest values, if loud enough
+                if tt > loud[last, rr]:
+                    jj = last
+                    while (jj > 0) and (loud[jj-1, rr] < tt):
+                        loud[jj, rr] = loud[jj-1, rr]
+                        jj -= 1
+                    loud[jj, rr] = tt
+
+    return both, loud
+
+
 def _gws_from_samples(vals, weights, fobs_gw_edges):
     """Calculate GW signals at the given frequencies, from weighted samples of a binary population.
 
@@ -523,7 +718,7 @@ def _gws_from_number_grid_integrated_redz(edges, redz, number, realize, sum=True
         else:
             log.warning(f"`sum`={sum} :: this requires a large amount of memory!")
             shape = number.shape + (realize,)
-            hc2 = hc2[..., np.newaxis] * poisson_as_needed(number[..., np.newaxis] * np.ones(shape))
+            hc2 = hc2[..., np.newaxis] * poisson_as_needed(number[..., np.newaxis], size=shape)
             if holo.sam._DEBUG:
                 log.info(f"number = {utils.stats(number)}")
                 log.info(f"hc2 = {utils.stats(hc2)}")
@@ -597,7 +792,7 @@ def _gws_from_number_grid_integrated(edges, number, realize, sum=True):
         else:
             log.warning(f"`sum`={sum} :: this requires a large amount of memory!")
             shape = number.shape + (realize,)
-            hc2 = hc2[..., np.newaxis] * poisson_as_needed(number[..., np.newaxis] * np.ones(shape))
+            hc2 = hc2[..., np.newaxis] * poisson_as_needed(number[..., np.newaxis], size=shape)
             if holo.sam._DEBUG:
                 log.info(f"number = {utils.stats(number)}")
                 log.info(f"hc2 = {utils.stats(hc2)}")
@@ -663,7 +858,7 @@ def gwb_ideal(fobs_gw, ndens, mtot, mrat, redz, dlog10, sum=True):
     return gwb
 
 
-def poisson_as_needed(values, thresh=1e10):
+def poisson_as_needed(values, thresh=1e10, size=None, dtype=float):
     """Calculate Poisson distribution when values are below threshold, otherwise approximate with normal distribution.
 
     Parameters
@@ -672,17 +867,33 @@ def poisson_as_needed(values, thresh=1e10):
         Expectation values for poisson distribution.
     thresh : float
         Expectation value above which to use Normal distribution approximation.
+    size : None or tuple of int
+        Shape of the output, to which `values` are broadcast (e.g. for multiple realizations).
+        If `None`, the shape of `values` is used.
+    dtype : data-type
+        Floating-point type of the output.
 
     Returns
     -------
     output : ndarray
         (Approximately) Poisson distributed values.
-        Same shape as input `values`.
+        Same shape as input `values`, or `size` if given.
 
     """
+    values = np.asarray(values, dtype=float)
+    if size is None:
+        size = values.shape
+
     # NOTE: do not use `int` type as it can cause overflow errors
     # output = np.zeros_like(values, dtype=int)
-    output = np.zeros_like(values)
+    output = np.zeros(size, dtype=dtype)
+    # when no values need the normal approximation, draw at the output shape directly,
+    # this produces the same values as the general case without broadcasting `values` first
+    if np.all(values <= thresh):
+        output[...] = np.random.poisson(values, size=size)
+        return output
+
+    values = np.broadcast_to(values, size)
     idx = (values <= thresh)
     output[idx] = np.random.poisson(values[idx])
     tt = values[~idx]
@@ -38,6 +38,7 @@ References
 from __future__ import annotations
 
 import abc
+import functools
 import json
 import os
 import warnings
@@ -66,6 +67,11 @@ class _Hardening(abc.ABC):
 
     CONSISTENT = None
 
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        # register all subclasses, for fast type-checking (see `is_hardening`)
+        _HARDENING_CLASSES.add(cls)
+
     @abc.abstractmethod
     def dadt_dedt(self, evo, step, *args, **kwargs):
         pass
@@ -79,6 +85,32 @@ class _Hardening(abc.ABC):
         return rv_dedt
 
 
+#: Registry of `_Hardening` and all of its subclasses (populated by `_Hardening.__init_subclass__`)
+_HARDENING_CLASSES = {_Hardening}
+
+
+def is_hardening(hard):
+    """Check whether `hard` is a hardening model, either a `_Hardening` subclass or an instance of one.
+
+    Registered (i.e. normal) subclasses are identified with a set lookup; virtual subclasses
+    (e.g. added with `_Hardening.register`) fall back to `isinstance` / `issubclass` checks.
+
+    Parameters
+    ----------
+    hard : object
+
+    Returns
+    -------
+    bool
+
+    """
+    if (type(hard) in _HARDENING_CLASSES):
+        return True
+    if isinstance(hard, type):
+        return (hard in _HARDENING_CLASSES) or issubclass(hard, _Hardening)
+    return isinstance(hard, _Hardening)
+
+
 # =================================================================================================
 # ====    Physical Hardening Classes    ====
 # =================================================================================================
@@ -1394,23 +1426,17 @@ class Fixed_Time_2PL_SAM(_Hardening):
             Instance configured for the given binary population.
 
         """
-        import holodeck.sams  # noqa
-        import holodeck.sams.sam_cyutils  # noqa
-
         assert np.ndim(time) == 0
         assert np.ndim(rchar) == 0
         assert np.ndim(gamma_inner) == 0
         assert np.ndim(gamma_outer) == 0
-        mtot, mrat = np.meshgrid(sam.mtot, sam.mrat, indexing='ij')
-        shape = mtot.shape
-        mt, mr = [mm.flatten() for mm in [mtot, mrat]]
 
-        norm_log10 = holo.sams.sam_cyutils.find_2pwl_hardening_norm(
-            time, mt, mr,
-            sepa_init, rchar, gamma_inner, gamma_outer, num_steps,
+        # (M, Q) ; NOTE: the mass grids are passed as tuples, and the scalars are coerced to python
+        #         types (0-d arrays are not hashable), so that the result can be cached
+        norm_log10 = _find_2pwl_hardening_norm(
+            float(time), tuple(sam.mtot), tuple(sam.mrat),
+            float(sepa_init), float(rchar), float(gamma_inner), float(gamma_outer), int(num_steps),
         )
-        # (M*Q,) ==> (M, Q)
-        norm_log10 = np.reshape(norm_log10, shape)
 
         self._target_time = time
         self._norm = 10.0 ** norm_log10
@@ -1803,3 +1829,32 @@ def _radius_loss_cone_BBR1980_dehnen(mbh, mstar, gamma=1.0):
     rstar = _radius_stellar_characteristic_dabringhausen_2008(mstar, gamma)
     rlc = np.power(mass_of_a_star / mbh, 0.25) * np.power(rbnd/rstar, 2.25) * rstar
     return rlc
+
+
+@functools.lru_cache(maxsize=8)
+def _find_2pwl_hardening_norm(time, mtot, mrat, sepa_init, rchar, gamma_inner, gamma_outer, num_steps):
+    """Find the normalization of the 2PL hardening rate giving the target total lifetime.
+
+    This wraps `holodeck.sams.sam_cyutils.find_2pwl_hardening_norm` on the grid of total-masses and
+    mass-ratios.  The result only depends on the mass grids and the hardening parameters, which are
+    often the same for many SAMs (e.g. library samples which only vary the galaxy parameters), so it
+    is cached.  All arguments must be hashable, i.e. the mass grids are given as tuples.
+
+    Returns
+    -------
+    norm_log10 : (M, Q) ndarray
+        Log10 of the hardening-rate normalization.  This array is read-only, as it is shared.
+
+    """
+    import holodeck.sams.sam_cyutils  # noqa
+
+    mt, mr = np.meshgrid(mtot, mrat, indexing='ij')
+    shape = mt.shape
+    norm_log10 = holo.sams.sam_cyutils.find_2pwl_hardening_norm(
+        time, mt.flatten(), mr.flatten(),
+        sepa_init, rchar, gamma_inner, gamma_outer, num_steps,
+    )
+    # (M*Q,) ==> (M, Q)
+    norm_log10 = np.reshape(norm_log10, shape)
+    norm_log10.flags.writeable = False
+    return norm_log10
@@ -8,6 +8,7 @@ import sys
 
 import numpy as np
 import scipy as sp
+import scipy.special  # noqa
 import scipy.stats
 
 import holodeck as holo
@@ -570,11 +571,12 @@ class PD_Normal(_Param_Dist):
         super().__init__(name, clip=clip, **kwargs)
         self._mean = mean
         self._stdev = stdev
-        self._frozen_dist = sp.stats.norm(loc=mean, scale=stdev)
         return
 
     def _dist_func(self, xx):
-        yy = self._frozen_dist.ppf(xx)
+        # inverse CDF of the standard normal, evaluated directly instead of through a frozen
+        # `scipy.stats.norm` (which adds argument validation overhead on every call)
+        yy = self._mean + self._stdev * sp.special.ndtri(xx)
         return yy
 
 
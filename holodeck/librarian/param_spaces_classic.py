@@ -43,38 +43,7 @@ class _PS_Classic_Phenom(_Param_Space):
 
     @classmethod
     def _init_sam(cls, sam_shape, params):
-        gsmf = sams.GSMF_Schechter(
-            phi0=params['gsmf_phi0_log10'],
-            phiz=params['gsmf_phiz'],
-            mchar0_log10=params['gsmf_mchar0_log10'],
-            mcharz=params['gsmf_mcharz'],
-            alpha0=params['gsmf_alpha0'],
-            alphaz=params['gsmf_alphaz'],
-        )
-        gpf = sams.GPF_Power_Law(
-            frac_norm_allq=params['gpf_frac_norm_allq'],
-            malpha=params['gpf_malpha'],
-            qgamma=params['gpf_qgamma'],
-            zbeta=params['gpf_zbeta'],
-            max_frac=params['gpf_max_frac'],
-        )
-        gmt = sams.GMT_Power_Law(
-            time_norm=params['gmt_norm']*GYR,
-            malpha=params['gmt_malpha'],
-            qgamma=params['gmt_qgamma'],
-            zbeta=params['gmt_zbeta'],
-        )
-        mmbulge = host_relations.MMBulge_KH2013(
-            mamp_log10=params['mmb_mamp_log10'],
-            mplaw=params['mmb_plaw'],
-            scatter_dex=params['mmb_scatter_dex'],
-        )
-
-        sam = sams.Semi_Analytic_Model(
-            gsmf=gsmf, gpf=gpf, gmt=gmt, mmbulge=mmbulge,
-            shape=sam_shape,
-        )
-        return sam
+        return _init_sam_classic(sam_shape, params, params['gsmf_phi0_log10'])
 
     @classmethod
     def _init_hard(cls, sam, params):
@@ -189,38 +158,7 @@ class _PS_Classic_GWOnly(_Param_Space):
 
     @classmethod
     def _init_sam(cls, sam_shape, params):
-        gsmf = sams.GSMF_Schechter(
-            phi0=params['gsmf_phi0'],
-            phiz=params['gsmf_phiz'],
-            mchar0_log10=params['gsmf_mchar0_log10'],
-            mcharz=params['gsmf_mcharz'],
-            alpha0=params['gsmf_alpha0'],
-            alphaz=params['gsmf_alphaz'],
-        )
-        gpf = sams.GPF_Power_Law(
-            frac_norm_allq=params['gpf_frac_norm_allq'],
-            malpha=params['gpf_malpha'],
-            qgamma=params['gpf_qgamma'],
-            zbeta=params['gpf_zbeta'],
-            max_frac=params['gpf_max_frac'],
-        )
-        gmt = sams.GMT_Power_Law(
-            time_norm=params['gmt_norm']*GYR,
-            malpha=params['gmt_malpha'],
-            qgamma=params['gmt_qgamma'],
-            zbeta=params['gmt_zbeta'],
-        )
-        mmbulge = host_relations.MMBulge_KH2013(
-            mamp_log10=params['mmb_mamp_log10'],
-            mplaw=params['mmb_plaw'],
-            scatter_dex=params['mmb_scatter_dex'],
-        )
-
-        sam = sams.Semi_Analytic_Model(
-            gsmf=gsmf, gpf=gpf, gmt=gmt, mmbulge=mmbulge,
-            shape=sam_shape,
-        )
-        return sam
+        return _init_sam_classic(sam_shape, params, params['gsmf_phi0'])
 
     @classmethod
     def _init_hard(cls, sam, params):
@@ -298,6 +236,47 @@ class PS_Test(_PS_Classic_Phenom):
         return
 
 
+def _init_sam_classic(sam_shape, params, gsmf_phi0):
+    """Construct the SAM used by all of the 'classic' parameter spaces.
+
+    The GSMF normalization is passed separately as `gsmf_phi0`, because it is named differently in
+    the phenomenological ('gsmf_phi0_log10') and GW-only ('gsmf_phi0') parameter spaces.
+
+    """
+    gsmf = sams.GSMF_Schechter(
+        phi0=gsmf_phi0,
+        phiz=params['gsmf_phiz'],
+        mchar0_log10=params['gsmf_mchar0_log10'],
+        mcharz=params['gsmf_mcharz'],
+        alpha0=params['gsmf_alpha0'],
+        alphaz=params['gsmf_alphaz'],
+    )
+    gpf = sams.GPF_Power_Law(
+        frac_norm_allq=params['gpf_frac_norm_allq'],
+        malpha=params['gpf_malpha'],
+        qgamma=params['gpf_qgamma'],
+        zbeta=params['gpf_zbeta'],
+        max_frac=params['gpf_max_frac'],
+    )
+    gmt = sams.GMT_Power_Law(
+        time_norm=params['gmt_norm']*GYR,
+        malpha=params['gmt_malpha'],
+        qgamma=params['gmt_qgamma'],
+        zbeta=params['gmt_zbeta'],
+    )
+    mmbulge = host_relations.MMBulge_KH2013(
+        mamp_log10=params['mmb_mamp_log10'],
+        mplaw=params['mmb_plaw'],
+        scatter_dex=params['mmb_scatter_dex'],
+    )
+
+    sam = sams.Semi_Analytic_Model(
+        gsmf=gsmf, gpf=gpf, gmt=gmt, mmbulge=mmbulge,
+        shape=sam_shape,
+    )
+    return sam
+
+
 _param_spaces_dict = {
     "PS_Test": PS_Test,
     "PS_Classic_Phenom_Uniform": PS_Classic_Phenom_Uniform,    # PS_Uniform_09B
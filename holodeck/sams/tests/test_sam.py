@@ -249,3 +249,30 @@ def test_dbn_phenom():
 
     return
 
+
+
+def test_fixed_time_2pl_sam_norm_reused():
+    """Make sure the cached `Fixed_Time_2PL_SAM` normalization matches between equivalent SAMs.
+    """
+    shape = (10, 11, 12)
+    TIME = 1.0e9 * YR
+    sam_1 = holo.sams.Semi_Analytic_Model(shape=shape)
+    # different galaxy stellar-mass function, but the same mass grids
+    gsmf = holo.sams.GSMF_Schechter(phi0=-2.5)
+    sam_2 = holo.sams.Semi_Analytic_Model(gsmf=gsmf, shape=shape)
+
+    hard_1 = holo.hardening.Fixed_Time_2PL_SAM(sam_1, TIME)
+    hard_2 = holo.hardening.Fixed_Time_2PL_SAM(sam_2, TIME)
+    assert np.all(hard_1._norm == hard_2._norm)
+
+    # 0-d arrays are valid scalar arguments, and must give the same (cached) result
+    hard_0d = holo.hardening.Fixed_Time_2PL_SAM(
+        sam_1, np.array(TIME), sepa_init=np.array(1.0e3*PC), rchar=np.array(10.0*PC),
+        gamma_inner=np.array(-1.0), gamma_outer=np.array(1.5), num_steps=np.array(300),
+    )
+    assert np.all(hard_1._norm == hard_0d._norm)
+
+    # a different lifetime must produce a different normalization
+    hard_3 = holo.hardening.Fixed_Time_2PL_SAM(sam_1, 2.0 * TIME)
+    assert not np.any(hard_1._norm == hard_3._norm)
+    return
@@ -0,0 +1,117 @@
+"""Tests for the :mod:`holodeck.anisotropy` submodule.
+"""
+
+import numpy as np
+import pytest
+
+hp = pytest.importorskip("healpy")
+
+from holodeck import anisotropy   # noqa
+from holodeck.constants import YR   # noqa
+
+
+@pytest.mark.parametrize("nside", [8, 16])
+@pytest.mark.parametrize("lmax", [2, 5, 8])
+def test_anafast_batched(nside, lmax):
+    """The batched spherical harmonic transform must match `hp.anafast` on each map.
+    """
+    npix = hp.nside2npix(nside)
+    maps = np.random.uniform(0.0, 1.0, (4, npix))
+    maps[1] = 10.0 ** np.random.uniform(-2, 2, npix)
+
+    test = anisotropy._anafast_batched(maps, lmax)
+    assert test.shape == (len(maps), lmax+1)
+    for mm, tt in zip(maps, test):
+        truth = hp.anafast(mm, lmax=lmax, iter=anisotropy.ANAFAST_ITER)
+        assert np.allclose(tt, truth, rtol=1e-10, atol=0.0)
+    return
+
+
+@pytest.mark.parametrize("lmax", [3, 8])
+def test_sph_harm_from_map_batched(monkeypatch, lmax):
+    """`sph_harm_from_map` must give the same result with and without the batched transform.
+    """
+    nfreqs, nreals = 3, 2
+    npix = hp.nside2npix(8)
+    moll_hc = np.random.uniform(0.0, 1.0, (nfreqs, nreals, npix))
+
+    batched = anisotropy.sph_harm_from_map(moll_hc, lmax=lmax)
+    # disable the dense-matrix transforms, so that `hp.anafast` is called on each map
+    monkeypatch.setattr(anisotropy, "SHT_MATRIX_MAX_SIZE", 0)
+    single = anisotropy.sph_harm_from_map(moll_hc, lmax=lmax)
+
+    assert batched.shape == single.shape == (nfreqs, nreals, lmax+1)
+    assert np.allclose(batched, single, rtol=1e-10, atol=0.0)
+    return
+
+
+def _cl_analytic_inputs(shape=(4, 3, 5), nfreqs=6):
+    fobs_orb_edges = np.logspace(-1, 0.5, nfreqs + 1) / YR
+    number = np.random.uniform(0.0, 5.0, shape + (nfreqs,))
+    hs = 10.0 ** np.random.uniform(-17, -15, shape + (nfreqs,))
+    return fobs_orb_edges, number, hs
+
+
+def test_cl_analytic_from_num_shapes():
+    """Check output shapes, and the non-realized values against a direct calculation.
+    """
+    nfreqs = 6
+    nreals = 7
+    edges, number, hs = _cl_analytic_inputs(nfreqs=nfreqs)
+
+    C0, Cl = anisotropy.Cl_analytic_from_num(edges, number, hs, realize=False)
+    assert C0.shape == Cl.shape == (nfreqs,)
+
+    df = np.diff(edges)
+    fc = 0.5 * (edges[1:] + edges[:-1])
+    nh2 = np.sum(number * hs**2, axis=(0, 1, 2))
+    nh4 = np.sum(number * hs**4, axis=(0, 1, 2))
+    Cl_truth = (fc / (4*np.pi*df))**2 * nh4
+    C0_truth = Cl_truth + (fc / (4*np.pi*df) * nh2)**2
+    assert np.allclose(Cl, Cl_truth, rtol=1e-12, atol=0.0)
+    assert np.allclose(C0, C0_truth, rtol=1e-12, atol=0.0)
+
+    C0, Cl = anisotropy.Cl_analytic_from_num(edges, number, hs, realize=nreals)
+    assert C0.shape == Cl.shape == (nfreqs, nreals)
+    assert np.all(C0 >= Cl)
+    return
+
+
+@pytest.mark.parametrize("chunk", [1, 3, 5])
+def test_cl_analytic_from_num_chunks(monkeypatch, chunk):
+    """Realizations must not depend on how many of them are drawn at once.
+    """
+    nreals = 10
+    edges, number, hs = _cl_analytic_inputs()
+
+    monkeypatch.setattr(anisotropy, "CL_REALIZE_CHUNK", nreals)
+    np.random.seed(1234)
+    truth = anisotropy.Cl_analytic_from_num(edges, number, hs, realize=nreals)
+
+    # `chunk` values both divide `nreals` (1, 5) and do not (3)
+    monkeypatch.setattr(anisotropy, "CL_REALIZE_CHUNK", chunk)
+    np.random.seed(1234)
+    test = anisotropy.Cl_analytic_from_num(edges, number, hs, realize=nreals)
+    for tt, vv in zip(truth, test):
+        assert np.allclose(tt, vv, rtol=1e-12, atol=0.0)
+    return
+
+
+def test_cl_analytic_from_num_fobs_args():
+    """Explicitly passed frequency bin widths and centers must match the derived defaults.
+    """
+    nreals = 5
+    edges, number, hs = _cl_analytic_inputs()
+    widths = np.diff(edges)
+    cents = 0.5 * (edges[1:] + edges[:-1])
+
+    for realize in [False, nreals]:
+        np.random.seed(99)
+        truth = anisotropy.Cl_analytic_from_num(edges, number, hs, realize=realize)
+        np.random.seed(99)
+        test = anisotropy.Cl_analytic_from_num(
+            edges, number, hs, realize=realize, fobs_orb_widths=widths, fobs_orb_cents=cents
+        )
+        for tt, vv in zip(truth, test):
+            assert np.allclose(tt, vv, rtol=1e-12, atol=0.0)
+    return
@@ -0,0 +1,89 @@
+"""Tests for the :mod:`holodeck.gravwaves` submodule.
+"""
+
+import numpy as np
+import pytest
+
+import holodeck as holo
+from holodeck import gravwaves, utils
+from holodeck.discrete import population, evolution
+from holodeck.constants import GYR, YR
+
+NFREQS = 5
+NHARMS = 8
+NREALS = 6
+NLOUDEST = 3
+_EMIT_KEYS = ['both', 'fore', 'back', 'strain', 'loudest', 'harms']
+
+
+@pytest.fixture(scope='module')
+def evo_eccen():
+    """Small eccentric population, evolved by GW emission and a fixed total lifetime.
+    """
+    np.random.seed(12345)
+    resamp = population.PM_Resample(0.1)
+    ecc = population.PM_Eccentricity()
+    pop = population.Pop_Illustris(mods=[resamp, ecc])
+    fixed = holo.hardening.Fixed_Time_2PL.from_pop(pop, 1.0 * GYR)
+    evo = evolution.Evolution(pop, [holo.hardening.Hard_GW(), fixed], nsteps=40)
+    evo.evolve()
+    return evo
+
+
+def _emit(evo, seed, **kwargs):
+    fobs_gw = utils.pta_freqs(16.0*YR, num=NFREQS)[0]
+    gw = gravwaves.GW_Discrete(evo, fobs_gw, nharms=NHARMS, nreals=NREALS)
+    np.random.seed(seed)
+    gw.emit(progress=False, nloudest=NLOUDEST, **kwargs)
+    return gw
+
+
+def _check_shapes(gw):
+    for kk in ['both', 'fore', 'back', 'strain']:
+        assert getattr(gw, kk).shape == (NFREQS, NREALS)
+    assert gw.loudest.shape == (NFREQS, NLOUDEST, NREALS)
+    assert gw.harms.shape == (NFREQS, NHARMS)
+    return
+
+
+def test_emit_serial_reproducible(evo_eccen):
+    """Serial `emit` must give identical results for the same seed, and non-trivial strains.
+    """
+    gw_1 = _emit(evo_eccen, 42)
+    gw_2 = _emit(evo_eccen, 42)
+    _check_shapes(gw_1)
+    # binaries must reach the band, otherwise this test is meaningless
+    assert np.all(gw_1.strain > 0.0)
+    assert np.all(np.isfinite(gw_1.strain))
+    for kk in _EMIT_KEYS:
+        assert np.array_equal(getattr(gw_1, kk), getattr(gw_2, kk)), f"'{kk}' is not reproducible!"
+
+    gw_3 = _emit(evo_eccen, 43)
+    assert not np.array_equal(gw_1.strain, gw_3.strain)
+    return
+
+
+def test_emit_chunks(evo_eccen, monkeypatch):
+    """Interpolating one frequency at a time must match interpolating all frequencies at once.
+    """
+    truth = _emit(evo_eccen, 42)
+    # force one frequency per chunk
+    monkeypatch.setattr(gravwaves, "_EMIT_INTERP_MAX_SIZE", 1)
+    test = _emit(evo_eccen, 42)
+    for kk in _EMIT_KEYS:
+        assert np.allclose(getattr(truth, kk), getattr(test, kk), rtol=1e-12, atol=0.0), kk
+    return
+
+
+def test_emit_parallel(evo_eccen):
+    """Parallel `emit` must run, return the right shapes, and be reproducible for a given seed.
+    """
+    gw_1 = _emit(evo_eccen, 42, nproc=2)
+    _check_shapes(gw_1)
+    assert np.all(gw_1.strain > 0.0)
+    assert np.all(np.isfinite(gw_1.strain))
+
+    gw_2 = _emit(evo_eccen, 42, nproc=2)
+    for kk in _EMIT_KEYS:
+        assert np.array_equal(getattr(gw_1, kk), getattr(gw_2, kk)), f"'{kk}' is not reproducible!"
+    return
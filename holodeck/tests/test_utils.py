@@ -96,3 +96,52 @@ class Test_GW_Methods:
         return
 
     # def test_hardening_dadt(self):
+
+
+def test_gw_freq_dist_func_cyutils():
+    """Make sure the compiled g(n,e) matches the python version, including zero eccentricities.
+    """
+    cyutils = pytest.importorskip("holodeck.cyutils")
+
+    num = 1000
+    harms = np.random.randint(1, 50, num)
+    eccen = np.random.uniform(0.0, 0.99, num)
+    eccen[:100] = 0.0
+    harms[:50] = 2
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        truth = utils.gw_freq_dist_func(harms, ee=eccen)
+    # `utils.gw_freq_dist_func` is invalid for zero eccentricities, g(n=2, e=0) = 1 and zero otherwise
+    sel_e0 = (eccen == 0.0)
+    truth[sel_e0] = 0.0
+    truth[sel_e0 & (harms == 2)] = 1.0
+
+    test = cyutils.gw_freq_dist_func(harms, eccen)
+    assert np.allclose(truth, test, rtol=1e-8, atol=1e-10)
+    return
+
+
+def test_cosmo_pchip():
+    """Make sure cached cosmology interpolants match `cosmopy`, and are rebuilt for new grids.
+    """
+    import cosmopy
+    from holodeck import cosmo
+
+    redz = np.random.uniform(0.0, 5.0, 100)
+    pchip = utils.cosmo_pchip(cosmo, '_grid_z', '_grid_lbk', '_sort_z')
+    assert np.all(pchip(redz) == cosmo.z_to_tlbk(redz))
+    # the same interpolant is reused for the same cosmology and grids
+    assert utils.cosmo_pchip(cosmo, '_grid_z', '_grid_lbk', '_sort_z') is pchip
+
+    # a different cosmology instance must not reuse the interpolant
+    other = cosmopy.Cosmology(h=0.5, Om0=0.5, Ob0=0.05, size=200)
+    test = utils.cosmo_pchip(other, '_grid_z', '_grid_lbk', '_sort_z')
+    assert test is not pchip
+    assert np.all(test(redz) == other.z_to_tlbk(redz))
+
+    # replacing the grids of a cosmology instance must rebuild its interpolant
+    tlbk = other.z_to_tlbk(redz)
+    other._grid_lbk = 2.0 * other._grid_lbk
+    test = utils.cosmo_pchip(other, '_grid_z', '_grid_lbk', '_sort_z')
+    assert np.allclose(test(redz), 2.0 * tlbk)
+    return
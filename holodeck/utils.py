@@ -30,6 +30,7 @@ import numba
 import numpy as np
 import numpy.typing as npt
 import scipy as sp
+import scipy.interpolate  # noqa
 import scipy.stats    # noqa
 import scipy.special  # noqa
 
@@ -1551,6 +1552,55 @@ def fit_turnover_psd(xx, yy, fref, init=[-16, -13/3, 0.3/YR, 2.5]):
 # =================================================================================================
 
 
+#: interpolants constructed by `cosmo_pchip`, keyed by cosmology instance and grid names
+_COSMO_PCHIP_CACHE = {}
+_COSMO_PCHIP_CACHE_SIZE = 16
+
+
+def cosmo_pchip(cosmology, xgrid, ygrid, sort):
+    """Interpolant between two of the grids of a cosmology instance, built once and then reused.
+
+    The ``cosmopy.Cosmology`` conversion methods (e.g. ``cosmo.z_to_tlbk``) construct a new PCHIP
+    interpolant between their precomputed grids on every call.  The interpolant returned here is
+    identical, but it is cached, so repeated conversions (e.g. for each frequency in
+    `holodeck.gravwaves`, or in each `holodeck.discrete.evolution.Evolution` instance) reuse it.
+
+    Cached interpolants are stored for each cosmology instance, and are only reused while that
+    instance still holds the same grid arrays, i.e. they are rebuilt if the grids are replaced.
+
+    Parameters
+    ----------
+    cosmology : ``cosmopy.Cosmology`` instance
+        Cosmology whose grids are interpolated, typically ``holodeck.cosmo``.
+    xgrid, ygrid : str
+        Names of the `cosmology` attributes with the grids of independent and dependent values,
+        e.g. ``'_grid_z'`` and ``'_grid_lbk'``.
+    sort : str
+        Name of the `cosmology` attribute with the indices that sort `xgrid`, e.g. ``'_sort_z'``.
+
+    Returns
+    -------
+    pchip : ``scipy.interpolate.PchipInterpolator``
+        Interpolant from `xgrid` to `ygrid` values, returning NaN outside of the grid.
+
+    """
+    grids = (getattr(cosmology, xgrid), getattr(cosmology, ygrid), getattr(cosmology, sort))
+    key = (id(cosmology), xgrid, ygrid, sort)
+    entry = _COSMO_PCHIP_CACHE.get(key)
+    # NOTE: the cosmology and grid arrays themselves are stored, so that their `id`s cannot be reused
+    if (entry is not None) and (entry[0] is cosmology) and all(aa is bb for aa, bb in zip(entry[1], grids)):
+        return entry[2]
+
+    xx, yy, inds = grids
+    pchip = sp.interpolate.PchipInterpolator(xx[inds], yy[inds], extrapolate=False)
+    _COSMO_PCHIP_CACHE.pop(key, None)
+    if len(_COSMO_PCHIP_CACHE) >= _COSMO_PCHIP_CACHE_SIZE:
+        # remove the oldest entry
+        _COSMO_PCHIP_CACHE.pop(next(iter(_COSMO_PCHIP_CACHE)))
+    _COSMO_PCHIP_CACHE[key] = (cosmology, grids, pchip)
+    return pchip
+
+
 def dfdt_from_dadt(dadt, sepa, mtot=None, frst_orb=None):
     """Convert from hardening rate in separation to hardening rate in frequency.
 